@@ -1,63 +1,176 @@
-from fastapi import FastAPI, HTTPException, Depends
-from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Depends, Query, Response
+from contextlib import ExitStack, asynccontextmanager, suppress
 from datetime import datetime
-from google.cloud import logging
-from typing import List, Annotated
-from sqlmodel import Session, SQLModel, create_engine, select
+from functools import cache
+from typing import TYPE_CHECKING, List, Annotated
+from sqlalchemy import QueuePool, text
+from sqlmodel import Session, create_engine, select
 
 from src.app.infrastructure.http import LogEntryNotFoundException
-from src.app.infrastructure.config import ServiceAccountFileNotFouncError
+from src.app.infrastructure.logging_client import create_logging_client
+from src.app.repository.migration import migrate_schema
 from src.app.repository.model import Log
+from src.app.repository.retention import (
+    LogsRetentionRepository,
+    RetentionMetrics,
+    RetentionPolicy,
+)
 from src.app.repository.log import (
     CloudLogsQuery,
+    CloudLogsUnavailableException,
     InvalidFilterQueryException,
     MissingQueryParameterException,
 )
+from src.app.repository.resilient import (
+    CloudLogsGuard,
+    CloudLogsGuardMetrics,
+    ResilientCloudLogsQuery,
+)
 
+from src.app.service.fingerprint import MAX_LOG_GROUPS, group_logs
+from src.app.service.ingest import LogsIngestionService
 from src.app.service.log import LogsService
-from src.app.repository.domain import LogEntry
+from src.app.service.retention import RetentionService
+from src.app.repository.domain import IngestResult, LogEntry, LogGroup, to_naive_utc
+from src.app.repository.store import LogsStore
+from src.pkg.bloom import BloomFilter
+from src.pkg.cache import SharedQueryCache
+from src.pkg.circuit_breaker import CircuitBreaker
+from src.pkg.executor import BoundedExecutor
 from src.pkg.settings import Settings
 
+import asyncio
 import json
+import logging
+import threading
+
+if TYPE_CHECKING:
+    from google.cloud.logging import Client
+
+
+logger = logging.getLogger(__name__)
 
 
 # Define the FastAPI app wrapper
-def api_factory(settings: Settings) -> FastAPI:
+def api_factory(
+    settings: Settings,
+    logging_client: "Client | None" = None,
+    query_cache: SharedQueryCache | None = None,
+) -> FastAPI:
     mysql_conn_string = settings.get_mysql_connection_string()
     if mysql_conn_string is None:
         raise ValueError("Mysql connection string must be set")
-    if settings.get_service_account_credentialsr() is None:
+    if logging_client is None and settings.get_service_account_credentialsr() is None:
         raise ValueError("Google service account JSON key string must be set")
 
     engine = create_engine(mysql_conn_string)
 
     def create_db_and_tables():
-        SQLModel.metadata.create_all(engine)
+        migrate_schema(engine)
 
     def get_session():
         with Session(engine) as session:
             yield session
 
+    logging_client_lock = threading.Lock()
+
+    def get_logging_client() -> "Client":
+        nonlocal logging_client
+        if logging_client is None:
+            with logging_client_lock:
+                if logging_client is None:
+                    logging_client = create_logging_client(
+                        settings.get_service_account_credentialsr(),
+                        rpc_timeout=settings.cloud_logs_deadline_seconds,
+                    )
+        return logging_client
+
+    def warm_db_pool():
+        pool_size = engine.pool.size() if isinstance(engine.pool, QueuePool) else 1
+        with ExitStack() as stack:
+            for _ in range(pool_size):
+                stack.enter_context(engine.connect()).execute(text("SELECT 1"))
+
+    async def warm_up():
+        results = await asyncio.gather(
+            asyncio.to_thread(get_logging_client),
+            asyncio.to_thread(warm_db_pool),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                logger.warning("Warm-up failed: %r", result)
+
+    # Dedicated threads for the blocking Cloud Logging calls, so calls stuck on
+    # a slow backend do not take the default executor used by everything else
+    cloud_logs_executor = BoundedExecutor(
+        max_workers=settings.cloud_logs_max_workers, thread_name_prefix="cloud-logs"
+    )
+    cloud_logs_guard = CloudLogsGuard(
+        circuit_breaker=CircuitBreaker(
+            failure_threshold=settings.circuit_breaker_failure_threshold,
+            reset_timeout=settings.circuit_breaker_reset_seconds,
+        ),
+        deadline=settings.cloud_logs_deadline_seconds,
+        hedge_delay=settings.cloud_logs_hedge_delay_seconds,
+        executor=cloud_logs_executor,
+    )
+
     def get_logs_service():
-        try:
-            logging_client = logging.Client.from_service_account_json(
-                settings.service_account_credentials
-            )
-        except FileNotFoundError as e:
-            raise ServiceAccountFileNotFouncError(
-                f"Cannot read service account file for logging client: {str(e)}"
-            )
-        logs_repo = CloudLogsQuery(logging_client)
-        logs_service = LogsService(logs_repository=logs_repo)
+        logs_repo = ResilientCloudLogsQuery(
+            CloudLogsQuery(get_logging_client(), executor=cloud_logs_executor),
+            guard=cloud_logs_guard,
+        )
+        logs_service = LogsService(
+            logs_repository=logs_repo,
+            query_cache=query_cache,
+            cache_ttl=settings.query_cache_ttl_seconds,
+            metrics=cloud_logs_guard.metrics,
+        )
         yield logs_service
 
+    retention_service = None
+    if settings.get_log_retention_days() is not None:
+        retention_policy = RetentionPolicy(
+            retention_days=settings.get_log_retention_days(),
+            batch_size=settings.log_retention_batch_size,
+            rollup=settings.log_retention_rollup,
+            # Every worker schedules the job, the lease lets one run per interval
+            lease_seconds=settings.log_retention_interval_seconds,
+        )
+        retention_service = RetentionService(
+            retention_repository=LogsRetentionRepository(engine, retention_policy),
+            interval_seconds=settings.log_retention_interval_seconds,
+        )
+
+    seen_filter = BloomFilter(
+        capacity=settings.dedup_bloom_capacity,
+        error_rate=settings.dedup_bloom_error_rate,
+    )
+
+    def get_ingestion_service(session: Annotated[Session, Depends(get_session)]):
+        yield LogsIngestionService(
+            logs_store=LogsStore(session), seen_filter=seen_filter
+        )
+
     SessionDep = Annotated[Session, Depends(get_session)]
     LogsSevicetDep = Annotated[LogsService, Depends(get_logs_service)]
 
     @asynccontextmanager
     async def lifespan(app: FastAPI):
-        create_db_and_tables()
+        tasks = []
+        if settings.fast_start:
+            # Schema is created by `python migrate.py`, warm up in the background
+            tasks.append(asyncio.create_task(warm_up()))
+        else:
+            create_db_and_tables()
+        if retention_service is not None:
+            tasks.append(asyncio.create_task(retention_service.run_periodically()))
         yield
+        for task in tasks:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
 
     app = FastAPI(lifespan=lifespan)
 
@@ -69,10 +182,12 @@ def api_factory(settings: Settings) -> FastAPI:
             400: {"description": "Missing required parameters."},
             422: {"description": "Invalid filter query provided."},
             500: {"description": "Internal server error."},
+            503: {"description": "Cloud Logging backend is unavailable."},
         },
     )
     async def get_logs(
         logs_service: Annotated[LogsService, Depends(get_logs_service)],
+        response: Response,
         cloud_function_name: str,
         cloud_function_region: str,
         start_time: str,
@@ -89,7 +204,7 @@ def api_factory(settings: Settings) -> FastAPI:
         :param end_time: End of the time range for logs (ISO 8601 format).
         :param log_query: (Optional) The string query to filter logs.
         :param severity: (Optional) Minimum severity level for logs (e.g., "ERROR").
-        :return: List of LogEntry objects.
+        :return: List of LogEntry objects, marked with a `Warning` header when stale.
         :raises HTTPException: If any required parameter is missing or the filter query is invalid.
         """
         try:
@@ -101,6 +216,8 @@ def api_factory(settings: Settings) -> FastAPI:
                 end_time=datetime.fromisoformat(end_time),
                 severity=severity,
             )
+            if logs_service.served_stale:
+                response.headers["Warning"] = '110 - "Response is Stale"'
             return [log.get_log_entry() for log in logs]
         except Exception as e:
             if isinstance(e, MissingQueryParameterException) or isinstance(
@@ -113,6 +230,69 @@ def api_factory(settings: Settings) -> FastAPI:
                 raise HTTPException(
                     status_code=422, detail="Invalid filter query provided."
                 )
+            if isinstance(e, CloudLogsUnavailableException):
+                raise HTTPException(status_code=503, detail=str(e))
+            raise HTTPException(
+                status_code=500, detail=f"Internal server error: {repr(e)}."
+            )
+
+    # Group GCP logs for service by message fingerprint
+    @app.get(
+        "/logs/{cloud_function_name}/groups",
+        response_model=List[LogGroup],
+        responses={
+            400: {"description": "Missing required parameters."},
+            422: {"description": "Invalid filter query provided."},
+            500: {"description": "Internal server error."},
+            503: {"description": "Cloud Logging backend is unavailable."},
+        },
+    )
+    async def get_log_groups(
+        logs_service: Annotated[LogsService, Depends(get_logs_service)],
+        cloud_function_name: str,
+        cloud_function_region: str,
+        start_time: str,
+        end_time: str,
+        log_query: str = "",
+        severity: str = "DEFAULT",
+        top_k: Annotated[int, Query(ge=1, le=MAX_LOG_GROUPS)] = 10,
+    ):
+        """
+        Group logs of a specified Cloud Function by normalized message fingerprint.
+
+        :param cloud_function_name: Name of the Cloud Function to query logs for.
+        :param cloud_function_region: Region of the Cloud Function.
+        :param start_time: Start of the time range for logs (ISO 8601 format).
+        :param end_time: End of the time range for logs (ISO 8601 format).
+        :param log_query: (Optional) The string query to filter logs.
+        :param severity: (Optional) Minimum severity level for logs (e.g., "ERROR").
+        :param top_k: (Optional) Number of largest groups to return.
+        :return: List of LogGroup objects, largest first.
+        :raises HTTPException: If any required parameter is missing or the filter query is invalid.
+        """
+        try:
+            return await logs_service.get_log_groups(
+                cloud_function_name=cloud_function_name,
+                cloud_function_region=cloud_function_region,
+                query=log_query,
+                start_time=datetime.fromisoformat(start_time),
+                end_time=datetime.fromisoformat(end_time),
+                severity=severity,
+                top_k=top_k,
+            )
+        except Exception as e:
+            if isinstance(e, MissingQueryParameterException) or isinstance(
+                e, ValueError
+            ):
+                raise HTTPException(
+                    status_code=400, detail="Missing required parameters."
+                )
+            if isinstance(e, InvalidFilterQueryException):
+                raise HTTPException(
+                    status_code=422, detail="Invalid filter query provided."
+                )
+            if isinstance(e, CloudLogsUnavailableException):
+                raise HTTPException(status_code=503, detail=str(e))
             raise HTTPException(
                 status_code=500, detail=f"Internal server error: {repr(e)}."
             )
@@ -127,27 +307,99 @@ def api_factory(settings: Settings) -> FastAPI:
         },
     )
     def store_log_query(
-        log: LogEntry, session: Annotated[Session, Depends(get_session)]
+        log: LogEntry,
+        ingestion_service: Annotated[
+            LogsIngestionService, Depends(get_ingestion_service)
+        ],
     ):
         """
-        Store a log entry to the database.
+        Store a log entry to the database, ignoring already stored duplicates.
 
         :param log: LogEntry object to be stored.
+        :param ingestion_service: Log ingestion service dependency.
+        :return: Stored LogEntry object with its insertId.
+        :raises HTTPException: If any required parameter is missing or an internal server error occurs.
+        """
+        try:
+            ingestion_service.ingest([log])
+            return log.model_copy(update={"insertId": log.get_insert_id()})
+        except Exception as e:
+            if isinstance(e, ValueError):
+                raise HTTPException(
+                    status_code=400, detail="Missing required parameters."
+                )
+            raise HTTPException(
+                status_code=500, detail=f"Internal server error: {repr(e)}."
+            )
+
+    # Store multiple log entries to the database
+    @app.post(
+        "/logs",
+        response_model=IngestResult,
+        responses={
+            400: {"description": "Missing required parameters."},
+            500: {"description": "Internal server error."},
+        },
+    )
+    def store_logs_query(
+        logs: list[LogEntry],
+        ingestion_service: Annotated[
+            LogsIngestionService, Depends(get_ingestion_service)
+        ],
+    ):
+        """
+        Store multiple log entries to the database, ignoring already stored duplicates.
+
+        :param logs: List of LogEntry objects to be stored.
+        :param ingestion_service: Log ingestion service dependency.
+        :return: IngestResult with received, inserted and duplicate counts.
+        :raises HTTPException: If any required parameter is missing or an internal server error occurs.
+        """
+        try:
+            return ingestion_service.ingest(logs)
+        except Exception as e:
+            if isinstance(e, ValueError):
+                raise HTTPException(
+                    status_code=400, detail="Missing required parameters."
+                )
+            raise HTTPException(
+                status_code=500, detail=f"Internal server error: {repr(e)}."
+            )
+
+    # Group stored log entries by message fingerprint
+    @app.get(
+        "/log/groups",
+        response_model=List[LogGroup],
+        responses={
+            400: {"description": "Missing required parameters."},
+            500: {"description": "Internal server error."},
+        },
+    )
+    def get_stored_log_groups(
+        session: Annotated[Session, Depends(get_session)],
+        start_time: datetime,
+        end_time: datetime,
+        severity: str | None = None,
+        top_k: Annotated[int, Query(ge=1, le=MAX_LOG_GROUPS)] = 10,
+    ):
+        """
+        Group stored log entries by normalized message fingerprint.
+
         :param session: Database session dependency.
-        :return: Stored LogEntry object.
+        :param start_time: Start of the time range for logs.
+        :param end_time: End of the time range for logs.
+        :param severity: (Optional) Severity of the log entries (e.g., "ERROR").
+        :param top_k: (Optional) Number of largest groups to return.
+        :return: List of LogGroup objects, largest first.
         :raises HTTPException: If any required parameter is missing or an internal server error occurs.
         """
         try:
-            log_db = Log(
-                severity=log.severity,
-                textPayload=log.textPayload,
-                timestamp=log.timestamp.strftime("%Y-%m-%d %H:%M:%S"),
-                resource=json.dumps(log.resource),
+            logs = LogsStore(session).stream_logs(
+                start_time=to_naive_utc(start_time),
+                end_time=to_naive_utc(end_time),
+                severity=severity,
             )
-            session.add(log_db)
-            session.commit()
-            session.refresh(log_db)
-            return log
+            return group_logs(logs, top_k=top_k)
         except Exception as e:
             if isinstance(e, ValueError):
                 raise HTTPException(
@@ -195,14 +447,66 @@ def api_factory(settings: Settings) -> FastAPI:
                 severity=query_log.severity,
                 textPayload=query_log.textPayload,
                 resource=json.loads(query_log.resource) if query_log.resource else {},
+                insertId=query_log.insertId,
             )
         except Exception as e:
             if isinstance(e, LogEntryNotFoundException):
                 raise HTTPException(status_code=404, detail=str(e))
             raise HTTPException(status_code=400, detail="Missing required parameters.")
 
+    # Get progress metrics of the stored logs retention job
+    @app.get(
+        "/metrics/retention",
+        response_model=RetentionMetrics,
+        responses={
+            404: {"description": "Log retention is not enabled."},
+        },
+    )
+    async def get_retention_metrics():
+        """
+        Get progress metrics of the stored logs retention job.
+
+        :return: RetentionMetrics object.
+        :raises HTTPException: If log retention is not enabled.
+        """
+        if retention_service is None:
+            raise HTTPException(status_code=404, detail="Log retention is not enabled.")
+        return retention_service.get_metrics()
+
+    # Get circuit breaker, deadline and hedging metrics of the Cloud Logging backend
+    @app.get("/metrics/cloud-logs", response_model=CloudLogsGuardMetrics)
+    async def get_cloud_logs_metrics():
+        """
+        Get circuit breaker, deadline and hedging metrics of the Cloud Logging backend.
+
+        Under the pre-fork server (serve.py) every worker has its own circuit
+        breaker, so the metrics are those of the worker answering the request.
+
+        :return: CloudLogsGuardMetrics object.
+        """
+        return cloud_logs_guard.metrics
+
     return app
 
 
-# Initialize the FastAPI app
-app = api_factory(settings=Settings())
+# Initialize the FastAPI app on first access, so importing this module stays cheap
+@cache
+def get_app() -> FastAPI:
+    settings = Settings()
+    # Cached results are also the stale fallback while the circuit breaker is
+    # open, so a single process gets its own cache; serve.py shares one instead
+    query_cache = SharedQueryCache(
+        slots=settings.query_cache_slots, slot_size=settings.query_cache_slot_size
+    )
+    return api_factory(settings=settings, query_cache=query_cache)
+
+
+def __getattr__(name: str):
+    if name == "app":
+        return get_app()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    # `fastapi dev` discovers the app through dir(), list the lazy one too
+    return sorted([*globals(), "app"])
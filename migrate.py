@@ -0,0 +1,23 @@
+from sqlmodel import create_engine
+
+from src.app.repository.migration import migrate_schema
+from src.pkg.settings import Settings
+
+
+def migrate(settings: Settings) -> None:
+    """
+    Create the database schema and the columns and indexes missing on existing tables,
+    used instead of the app lifespan in fast-start mode.
+
+    :param settings: Application settings.
+    """
+    mysql_conn_string = settings.get_mysql_connection_string()
+    if mysql_conn_string is None:
+        raise ValueError("Mysql connection string must be set")
+    engine = create_engine(mysql_conn_string)
+    migrate_schema(engine)
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    migrate(Settings())
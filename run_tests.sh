@@ -2,7 +2,7 @@
 
 # Valiate user input
 if [ -z "$1" ]; then
-    echo -n "Enter testing mode (integration|unit|api|all): " 
+    echo -n "Enter testing mode (integration|unit|api|bench|all): " 
     read testing_mode
 else
     testing_mode=$1
@@ -23,6 +23,10 @@ elif [ "$testing_mode" == "api" ]; then
     echo ">>> Warning! App must be running at least on localhost:8000!"
 
     python -m pytest ./test_main.py
+elif [ "$testing_mode" == "bench" ]; then
+    # Runs against a fake Cloud Logging client and SQLite, see --help for options
+    python -m tests.benchmark.bench_api "${@:2}"
+    python -m tests.benchmark.bench_startup
 elif [ "$testing_mode" == "all" ]; then
      python -m pytest './tests/unit/.'
     python -m pytest './tests/integration/.'
@@ -31,6 +35,6 @@ elif [ "$testing_mode" == "all" ]; then
 
     python -m pytest ./test_main.py
 else
-    echo "Invalid testing mode. Please enter either 'integration', 'unit' or 'api'"
+    echo "Invalid testing mode. Please enter either 'integration', 'unit', 'api' or 'bench'"
     exit 1
 fi
@@ -0,0 +1,32 @@
+from main import api_factory
+from migrate import migrate
+from src.pkg.cache import SharedQueryCache
+from src.pkg.server import serve
+from src.pkg.settings import Settings
+
+import argparse
+import logging
+
+
+# Production entry point: preloads the app once and forks N uvicorn workers
+# sharing a single query cache.
+if __name__ == "__main__":
+    settings = Settings()
+
+    parser = argparse.ArgumentParser(description="Run the logs reader API workers.")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=settings.server_workers)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    if not settings.fast_start:
+        # Create the schema once, before the workers race to do it in their lifespan
+        migrate(settings)
+
+    query_cache = SharedQueryCache(
+        slots=settings.query_cache_slots, slot_size=settings.query_cache_slot_size
+    )
+    app = api_factory(settings=settings, query_cache=query_cache)
+    serve(app, host=args.host, port=args.port, workers=args.workers)
@@ -0,0 +1,67 @@
+from typing import TYPE_CHECKING
+
+from src.app.infrastructure.config import ServiceAccountFileNotFouncError
+
+import functools
+
+if TYPE_CHECKING:
+    from google.cloud.logging import Client
+
+
+def create_logging_client(
+    service_account_credentials: str | None, rpc_timeout: float | None = None
+) -> "Client":
+    """
+    Create a Cloud Logging client from a service account JSON key file.
+
+    The google-cloud-logging stack (grpc, protobuf) is slow to import, so it
+    is only imported on first use instead of at application start.
+
+    :param service_account_credentials: Path to the service account JSON key file.
+    :param rpc_timeout: (Optional) Seconds a single `list_entries` page request may take.
+    :return: Logging Client.
+    :raises ServiceAccountFileNotFouncError: If the service account file cannot be read.
+    """
+    from google.cloud import logging
+
+    try:
+        client = logging.Client.from_service_account_json(service_account_credentials)
+    except FileNotFoundError as e:
+        raise ServiceAccountFileNotFouncError(
+            f"Cannot read service account file for logging client: {str(e)}"
+        )
+    if rpc_timeout is not None:
+        set_list_entries_timeout(client, rpc_timeout)
+    return client
+
+
+def set_list_entries_timeout(client: "Client", rpc_timeout: float) -> None:
+    """
+    Bound every `list_entries` page request, retries included, by a timeout.
+
+    `Client.list_entries` takes no timeout, while the GAPIC default lets a
+    single page request retry for 60 seconds. A bounded request frees its
+    thread soon after the caller gave up on it.
+
+    :param client: Logging Client.
+    :param rpc_timeout: Seconds a single page request may take.
+    """
+    from google.api_core import exceptions, retry
+
+    gapic_api = getattr(client.logging_api, "_gapic_api", None)
+    if gapic_api is None:
+        # HTTP transport, requests are bound by the connection timeout
+        return
+    gapic_api.list_log_entries = functools.partial(
+        gapic_api.list_log_entries,
+        timeout=rpc_timeout,
+        retry=retry.Retry(
+            initial=0.1,
+            maximum=rpc_timeout,
+            multiplier=1.3,
+            predicate=retry.if_exception_type(
+                exceptions.InternalServerError, exceptions.ServiceUnavailable
+            ),
+            timeout=rpc_timeout,
+        ),
+    )
@@ -1,6 +1,23 @@
-from typing import Any, Dict, Protocol
-from datetime import datetime
-from pydantic import BaseModel
+from typing import Any, AsyncIterator, Dict, Protocol
+from datetime import datetime, timezone
+from hashlib import sha256
+from pydantic import BaseModel, Field
+
+import json
+
+
+def to_naive_utc(timestamp: datetime) -> datetime:
+    """
+    Convert a timestamp to the naive UTC form it is stored and compared in.
+
+    Aware timestamps are converted to UTC first, naive ones are taken as UTC.
+
+    :param timestamp: Naive or timezone-aware timestamp.
+    :return: Naive UTC timestamp.
+    """
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(timezone.utc)
+    return timestamp.replace(tzinfo=None)
 
 
 class LogEntry(BaseModel):
@@ -8,6 +25,7 @@ class LogEntry(BaseModel):
     severity: str | None
     textPayload: str | None
     resource: Dict[str, Any]
+    insertId: str | None = Field(default=None, max_length=128)
 
     def get_log_entry(self) -> dict:
         """
@@ -20,6 +38,7 @@ class LogEntry(BaseModel):
             "severity": self.severity,
             "textPayload": self.textPayload,
             "resource": self.resource,
+            "insertId": self.insertId,
         }
 
     def get_timestamp(self) -> datetime:
@@ -54,6 +73,49 @@ class LogEntry(BaseModel):
         """
         return self.resource
 
+    def get_insert_id(self) -> str:
+        """
+        Get the idempotency key of the log entry.
+
+        The client-supplied insertId is used when present, otherwise a stable
+        hash of the timestamp, severity, payload and resource is computed.
+
+        :return: Idempotency key of the log entry.
+        """
+        if self.insertId:
+            return self.insertId
+        # The same instant written with different offsets gets the same key
+        content = json.dumps(
+            [
+                to_naive_utc(self.timestamp).isoformat(),
+                self.severity,
+                self.textPayload,
+                self.resource,
+            ],
+            sort_keys=True,
+            default=str,
+        )
+        return sha256(content.encode()).hexdigest()
+
+
+class IngestResult(BaseModel):
+    received: int
+    inserted: int
+    # Repeats within the request and entries the unique index rejected
+    duplicates: int
+    # Entries skipped by the bloom filter, a false positive drops a new entry
+    probable_duplicates: int = 0
+
+
+class LogGroup(BaseModel):
+    fingerprint: str
+    pattern: str
+    count: int
+    count_error: int
+    first_seen: datetime
+    last_seen: datetime
+    sample: LogEntry
+
 
 class CloudLogsInterface(Protocol):
     async def query_logs(
@@ -65,3 +127,14 @@ class CloudLogsInterface(Protocol):
         query: str = "",
         severity: str = "DEFAULT",
     ) -> list[LogEntry]: ...
+
+    def stream_logs(
+        self,
+        cloud_function_name: str,
+        cloud_function_region: str,
+        start_time: datetime,
+        end_time: datetime,
+        query: str = "",
+        severity: str = "DEFAULT",
+        chunk_timeout: float | None = None,
+    ) -> AsyncIterator[LogEntry]: ...
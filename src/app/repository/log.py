@@ -1,7 +1,18 @@
-from google.cloud.logging import Client
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, Iterator
 from src.app.repository.domain import LogEntry, CloudLogsInterface
+from src.pkg.executor import BoundedExecutor
 
 from datetime import datetime
+from itertools import islice
+
+import asyncio
+import threading
+
+if TYPE_CHECKING:
+    from google.cloud.logging import Client
+
+
+STREAM_CHUNK_SIZE = 1000
 
 
 class MissingQueryParameterException(Exception):
@@ -18,26 +29,74 @@ class InvalidFilterQueryException(Exception):
         super().__init__(message)
 
 
+class CloudLogsUnavailableException(Exception):
+    """Custom exception for a failing or timed out logging backend."""
+
+    def __init__(self, message: str):
+        super().__init__(message)
+
+
+class CloudLogsTimeoutException(CloudLogsUnavailableException):
+    """Custom exception for a logging backend not responding within the deadline."""
+
+    def __init__(self, message: str):
+        super().__init__(message)
+
+
+def is_invalid_filter_error(error: Exception) -> bool:
+    """
+    Check whether a logging backend error was caused by an invalid filter.
+
+    Google API errors carry the HTTP status code in `code`. Only 400
+    (InvalidArgument) means the filter was rejected; quota exhaustion (429)
+    or auth errors (401, 403) are failures of the backend or its setup.
+
+    :param error: Error raised by the logging client.
+    :return: True for invalid filter errors.
+    """
+    return getattr(error, "code", None) == 400
+
+
+def to_backend_exception(error: Exception) -> Exception:
+    """
+    Map an error raised by the logging client to a repository exception.
+
+    :param error: Error raised by the logging client.
+    :return: InvalidFilterQueryException or CloudLogsUnavailableException.
+    """
+    if is_invalid_filter_error(error):
+        return InvalidFilterQueryException("Invalid filter query provided.")
+    return CloudLogsUnavailableException(f"Cloud Logging request failed: {repr(error)}")
+
+
 class CloudLogsQuery(CloudLogsInterface):
-    def __init__(self, client: Client):
+    def __init__(self, client: "Client", executor: BoundedExecutor | None = None):
         """
         Initialize the CloudLogsQuery with a logging client.
 
         :param client: Injected logging Client.
+        :param executor: (Optional) Dedicated executor for the blocking client calls,
+            defaults to the event loop's default executor.
         """
         self.client = client
+        self.executor = executor
 
-    async def query_logs(
-        self,
+    async def run_in_thread(self, func: Callable[..., Any], *args: Any) -> Any:
+        if self.executor is None:
+            return await asyncio.to_thread(func, *args)
+        return await self.executor.run(func, *args)
+
+    @staticmethod
+    def build_filter(
         cloud_function_name: str,
         cloud_function_region: str,
         start_time: datetime,
         end_time: datetime,
         query: str = "",
         severity: str = "DEFAULT",
-    ) -> list[LogEntry]:
+    ) -> str:
         """
-        Query logs for a specified Cloud Function within a given time range.
+        Build the Cloud Logging filter for a Cloud Function within a given time range.
 
         :param cloud_function_name: Name of the Cloud Function to query logs for.
         :param cloud_function_region: Region of the Cloud Function.
@@ -45,9 +104,8 @@ class CloudLogsQuery(CloudLogsInterface):
         :param end_time: End of the time range for logs (datetime object).
         :param query: (Optional) The string query to filter logs.
         :param severity: (Optional) Minimum severity level for logs (e.g., "ERROR").
-        :return: List of LogEntry objects.
+        :return: Log filter string.
         :raises MissingQueryParameterException: If any required parameter is missing.
-        :raises InvalidFilterQueryException: If the filter query is invalid.
         """
         if not all([cloud_function_name, cloud_function_region, start_time, end_time]):
             raise MissingQueryParameterException(
@@ -70,24 +128,170 @@ class CloudLogsQuery(CloudLogsInterface):
             """
         if query:
             log_filter += f"AND {query}"
+        return log_filter
+
+    @staticmethod
+    def to_log_entry(entry) -> LogEntry:
+        """
+        Convert a Cloud Logging entry to a LogEntry.
+
+        :param entry: Cloud Logging entry.
+        :return: LogEntry object.
+        """
+        text_payload = None
+        if isinstance(entry.payload, dict):
+            text_payload = entry.payload.get("message")
+        elif isinstance(entry.payload, str):
+            text_payload = entry.payload
+        return LogEntry(
+            timestamp=entry.timestamp.isoformat(),
+            severity=entry.severity,
+            textPayload=text_payload,
+            resource=entry.resource.labels,
+        )
+
+    async def query_logs(
+        self,
+        cloud_function_name: str,
+        cloud_function_region: str,
+        start_time: datetime,
+        end_time: datetime,
+        query: str = "",
+        severity: str = "DEFAULT",
+    ) -> list[LogEntry]:
+        """
+        Query logs for a specified Cloud Function within a given time range.
+
+        :param cloud_function_name: Name of the Cloud Function to query logs for.
+        :param cloud_function_region: Region of the Cloud Function.
+        :param start_time: Start of the time range for logs (datetime object).
+        :param end_time: End of the time range for logs (datetime object).
+        :param query: (Optional) The string query to filter logs.
+        :param severity: (Optional) Minimum severity level for logs (e.g., "ERROR").
+        :return: List of LogEntry objects.
+        :raises MissingQueryParameterException: If any required parameter is missing.
+        :raises InvalidFilterQueryException: If the filter query is invalid.
+        :raises CloudLogsUnavailableException: If the logging backend request fails.
+        """
+        log_filter = self.build_filter(
+            cloud_function_name=cloud_function_name,
+            cloud_function_region=cloud_function_region,
+            start_time=start_time,
+            end_time=end_time,
+            query=query,
+            severity=severity,
+        )
 
+        # Stops the thread once nobody waits for it, e.g. after a deadline
+        cancelled = threading.Event()
         try:
-            log_entries = self.client.list_entries(filter_=log_filter)
-            logs: list[LogEntry] = []
-            for entry in log_entries:
-                text_payload = None
-                if isinstance(entry.payload, dict):
-                    text_payload = entry.payload.get("message")
-                elif isinstance(entry.payload, str):
-                    text_payload = entry.payload
-                logs.append(
-                    LogEntry(
-                        timestamp=entry.timestamp.isoformat(),
-                        severity=entry.severity,
-                        textPayload=text_payload,
-                        resource=entry.resource.labels,
-                    )
+            # The client pages synchronously, keep it off the event loop
+            return await self.run_in_thread(self.fetch_logs, log_filter, cancelled)
+        except InvalidFilterQueryException:
+            raise
+        except Exception as e:
+            raise to_backend_exception(e)
+        finally:
+            cancelled.set()
+
+    def fetch_logs(
+        self, log_filter: str, cancelled: threading.Event | None = None
+    ) -> list[LogEntry]:
+        """
+        Fetch all log entries matching a filter.
+
+        :param log_filter: Log filter string.
+        :param cancelled: (Optional) Event stopping the fetch early, the partial
+            result is returned to nobody.
+        :return: List of LogEntry objects.
+        """
+        logs = []
+        for entry in self.client.list_entries(filter_=log_filter):
+            if cancelled is not None and cancelled.is_set():
+                break
+            logs.append(self.to_log_entry(entry))
+        return logs
+
+    def fetch_chunk(
+        self, log_entries: Iterator, cancelled: threading.Event | None = None
+    ) -> list[LogEntry]:
+        """
+        Fetch the next chunk of log entries from a running query.
+
+        :param log_entries: Iterator of Cloud Logging entries.
+        :param cancelled: (Optional) Event stopping the fetch early.
+        :return: Up to STREAM_CHUNK_SIZE LogEntry objects, empty when exhausted.
+        """
+        logs = []
+        for entry in islice(log_entries, STREAM_CHUNK_SIZE):
+            if cancelled is not None and cancelled.is_set():
+                break
+            logs.append(self.to_log_entry(entry))
+        return logs
+
+    async def stream_logs(
+        self,
+        cloud_function_name: str,
+        cloud_function_region: str,
+        start_time: datetime,
+        end_time: datetime,
+        query: str = "",
+        severity: str = "DEFAULT",
+        chunk_timeout: float | None = None,
+    ) -> AsyncIterator[LogEntry]:
+        """
+        Stream logs for a specified Cloud Function within a given time range.
+
+        Entries are fetched and converted in chunks of STREAM_CHUNK_SIZE in a
+        worker thread, so only one chunk is held in memory and the event loop
+        is not blocked.
+
+        :param cloud_function_name: Name of the Cloud Function to query logs for.
+        :param cloud_function_region: Region of the Cloud Function.
+        :param start_time: Start of the time range for logs (datetime object).
+        :param end_time: End of the time range for logs (datetime object).
+        :param query: (Optional) The string query to filter logs.
+        :param severity: (Optional) Minimum severity level for logs (e.g., "ERROR").
+        :param chunk_timeout: (Optional) Seconds a single chunk may take to arrive.
+        :return: Async iterator of LogEntry objects.
+        :raises MissingQueryParameterException: If any required parameter is missing.
+        :raises InvalidFilterQueryException: If the filter query is invalid.
+        :raises CloudLogsUnavailableException: If the logging backend request fails.
+        :raises CloudLogsTimeoutException: If a chunk does not arrive within `chunk_timeout`.
+        """
+        log_filter = self.build_filter(
+            cloud_function_name=cloud_function_name,
+            cloud_function_region=cloud_function_region,
+            start_time=start_time,
+            end_time=end_time,
+            query=query,
+            severity=severity,
+        )
+
+        cancelled = threading.Event()
+        try:
+            log_entries = iter(
+                self.client.list_entries(
+                    filter_=log_filter, page_size=STREAM_CHUNK_SIZE
                 )
-            return logs
-        except:
-            raise InvalidFilterQueryException("Invalid filter query provided.")
+            )
+            while True:
+                try:
+                    chunk = await asyncio.wait_for(
+                        self.run_in_thread(self.fetch_chunk, log_entries, cancelled),
+                        timeout=chunk_timeout,
+                    )
+                except asyncio.TimeoutError:
+                    raise CloudLogsTimeoutException(
+                        f"Cloud Logging did not respond within {chunk_timeout} seconds."
+                    )
+                if not chunk:
+                    break
+                for log in chunk:
+                    yield log
+        except (InvalidFilterQueryException, CloudLogsUnavailableException):
+            raise
+        except Exception as e:
+            raise to_backend_exception(e)
+        finally:
+            cancelled.set()
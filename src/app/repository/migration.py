@@ -0,0 +1,104 @@
+from sqlalchemy import Column, Engine, Index, inspect, text
+from sqlalchemy.engine import Inspector
+from sqlmodel import SQLModel
+
+from src.app.repository.model import JobLease, Log, LogRollup  # noqa: F401, registers the tables
+
+
+def get_add_column_statement(engine: Engine, column: Column) -> str:
+    """
+    Build the DDL adding a model column to its existing table.
+
+    :param engine: SQLAlchemy engine of the database.
+    :param column: Model column.
+    :return: ALTER TABLE statement.
+    """
+    quote = engine.dialect.identifier_preparer.quote
+    column_type = column.type.compile(dialect=engine.dialect)
+    statement = f"ALTER TABLE {quote(column.table.name)} ADD COLUMN {quote(column.name)} {column_type}"
+    if not column.nullable:
+        # Fails on tables with rows, there is no value to backfill them with
+        statement += " NOT NULL"
+    return statement
+
+
+def add_missing_columns(engine: Engine) -> list[str]:
+    """
+    Add the model columns missing on already existing tables.
+
+    `create_all` skips tables that already exist, so columns added to the
+    models later (e.g. `Log.insertId`) never reach existing deployments.
+    Constraints of the added columns are created as indexes, see
+    `create_missing_indexes`.
+
+    :param engine: SQLAlchemy engine of the database.
+    :return: Names of the added columns, as `table.column`.
+    """
+    inspector = inspect(engine)
+    added = []
+    with engine.begin() as connection:
+        for table in SQLModel.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing:
+                    connection.execute(text(get_add_column_statement(engine, column)))
+                    added.append(f"{table.name}.{column.name}")
+    return added
+
+
+def is_covered(index: Index, inspector: Inspector, table_name: str) -> bool:
+    """
+    Check whether an existing index or unique constraint already covers a model index.
+
+    Tables created before an index was declared may enforce the same
+    uniqueness with an unnamed constraint.
+
+    :param index: Model index.
+    :param inspector: SQLAlchemy inspector of the database.
+    :param table_name: Name of the table.
+    :return: True if the index does not need to be created.
+    """
+    columns = [column.name for column in index.columns]
+    existing = inspector.get_indexes(table_name)
+    if any(item["name"] == index.name for item in existing):
+        return True
+    if not index.unique:
+        return False
+    unique = [item for item in existing if item["unique"]]
+    unique += inspector.get_unique_constraints(table_name)
+    return any(item["column_names"] == columns for item in unique)
+
+
+def create_missing_indexes(engine: Engine) -> list[str]:
+    """
+    Create the model indexes missing on already existing tables.
+
+    `create_all` skips tables that already exist, so indexes added to the
+    models later (e.g. on `Log.timestamp`) never reach existing deployments.
+
+    :param engine: SQLAlchemy engine of the database.
+    :return: Names of the created indexes.
+    """
+    inspector = inspect(engine)
+    created = []
+    for table in SQLModel.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        for index in table.indexes:
+            if not is_covered(index, inspector, table.name):
+                index.create(engine)
+                created.append(index.name)
+    return created
+
+
+def migrate_schema(engine: Engine) -> list[str]:
+    """
+    Create missing tables, then missing columns and indexes on the existing ones.
+
+    :param engine: SQLAlchemy engine of the database.
+    :return: Names of the added columns and created indexes.
+    """
+    SQLModel.metadata.create_all(engine)
+    return add_missing_columns(engine) + create_missing_indexes(engine)
@@ -5,7 +5,20 @@ from datetime import datetime
 
 class Log(SQLModel, table=True):
     id: int | None = Field(default=None, primary_key=True)
-    timestamp: datetime = Field(index=False)
+    timestamp: datetime = Field(index=True)
     severity: str | None = Field(default=None, index=True)
     textPayload: str | None = Field(default=None, index=False)
     resource: str | None = Field(default=None, index=True)
+    insertId: str | None = Field(default=None, unique=True, index=True, max_length=128)
+
+
+class LogRollup(SQLModel, table=True):
+    hour: datetime = Field(primary_key=True)
+    severity: str = Field(primary_key=True)
+    count: int = Field(default=0)
+
+
+class JobLease(SQLModel, table=True):
+    name: str = Field(primary_key=True)
+    owner: str
+    expires_at: datetime
@@ -0,0 +1,234 @@
+from datetime import datetime
+from typing import AsyncIterator
+from pydantic import BaseModel
+
+from src.app.repository.domain import CloudLogsInterface, LogEntry
+from src.app.repository.log import (
+    CloudLogsTimeoutException,
+    CloudLogsUnavailableException,
+    InvalidFilterQueryException,
+    MissingQueryParameterException,
+)
+from src.pkg.circuit_breaker import CircuitBreaker, CircuitBreakerMetrics
+from src.pkg.executor import BoundedExecutor
+
+import asyncio
+
+
+class CircuitOpenException(CloudLogsUnavailableException):
+    """Custom exception for requests rejected by an open circuit breaker."""
+
+    def __init__(self, message: str):
+        super().__init__(message)
+
+
+class CloudLogsGuardMetrics(BaseModel):
+    circuit_breaker: CircuitBreakerMetrics
+    timeouts: int = 0
+    hedged_requests: int = 0
+    hedged_wins: int = 0
+    hedges_skipped: int = 0
+    stale_results_served: int = 0
+
+
+class CloudLogsGuard:
+    def __init__(
+        self,
+        circuit_breaker: CircuitBreaker,
+        deadline: float,
+        hedge_delay: float | None = None,
+        executor: BoundedExecutor | None = None,
+    ):
+        """
+        Initialize the state shared by all guarded Cloud Logging requests.
+
+        The state lives in the process, under the pre-fork server every
+        worker has its own circuit breaker and metrics.
+
+        :param circuit_breaker: Circuit breaker around the logging backend.
+        :param deadline: Seconds a single query, or a single streamed chunk, may take.
+        :param hedge_delay: (Optional) Seconds after which a second attempt is started.
+        :param executor: (Optional) Executor running the queries, no hedged attempt
+            is started while it is saturated.
+        """
+        self.circuit_breaker = circuit_breaker
+        self.deadline = deadline
+        self.hedge_delay = hedge_delay
+        self.executor = executor
+        self.metrics = CloudLogsGuardMetrics(circuit_breaker=circuit_breaker.metrics)
+
+
+class ResilientCloudLogsQuery(CloudLogsInterface):
+    def __init__(self, logs_repository: CloudLogsInterface, guard: CloudLogsGuard):
+        """
+        Initialize the ResilientCloudLogsQuery around a logs repository.
+
+        :param logs_repository: Injected logs repository doing the actual queries.
+        :param guard: Shared circuit breaker, deadlines and hedging.
+        """
+        self.logs_repository = logs_repository
+        self.guard = guard
+
+    async def query_logs(
+        self,
+        cloud_function_name: str,
+        cloud_function_region: str,
+        start_time: datetime,
+        end_time: datetime,
+        query: str = "",
+        severity: str = "DEFAULT",
+    ) -> list[LogEntry]:
+        """
+        Query logs with a deadline, hedging and a circuit breaker.
+
+        :param cloud_function_name: Name of the Cloud Function to query logs for.
+        :param cloud_function_region: Region of the Cloud Function.
+        :param start_time: Start of the time range for logs (datetime object).
+        :param end_time: End of the time range for logs (datetime object).
+        :param query: (Optional) The string query to filter logs.
+        :param severity: (Optional) Minimum severity level for logs (e.g., "ERROR").
+        :return: List of LogEntry objects.
+        :raises MissingQueryParameterException: If any required parameter is missing.
+        :raises InvalidFilterQueryException: If the filter query is invalid.
+        :raises CloudLogsUnavailableException: If the backend fails or times out.
+        :raises CircuitOpenException: If the circuit breaker is open.
+        """
+        query_params = dict(
+            cloud_function_name=cloud_function_name,
+            cloud_function_region=cloud_function_region,
+            start_time=start_time,
+            end_time=end_time,
+            query=query,
+            severity=severity,
+        )
+        circuit_breaker = self.guard.circuit_breaker
+
+        if not circuit_breaker.allow_request():
+            raise CircuitOpenException("Cloud Logging circuit breaker is open.")
+
+        try:
+            logs = await asyncio.wait_for(
+                self.query_logs_hedged(query_params), timeout=self.guard.deadline
+            )
+        except (MissingQueryParameterException, InvalidFilterQueryException):
+            # The backend answered, the request was wrong
+            circuit_breaker.record_success()
+            raise
+        except asyncio.CancelledError:
+            circuit_breaker.release()
+            raise
+        except asyncio.TimeoutError:
+            self.guard.metrics.timeouts += 1
+            circuit_breaker.record_failure()
+            raise CloudLogsTimeoutException(
+                f"Cloud Logging did not respond within {self.guard.deadline} seconds."
+            )
+        except Exception:
+            circuit_breaker.record_failure()
+            raise
+
+        circuit_breaker.record_success()
+        return logs
+
+    async def query_logs_hedged(self, query_params: dict) -> list[LogEntry]:
+        """
+        Query logs, starting a second attempt if the first one is slow.
+
+        :param query_params: Keyword arguments of the repository query.
+        :return: List of LogEntry objects of the first successful attempt.
+        """
+        first = asyncio.ensure_future(self.logs_repository.query_logs(**query_params))
+        if self.guard.hedge_delay is None:
+            return await first
+
+        pending = {first}
+        try:
+            done, _ = await asyncio.wait(pending, timeout=self.guard.hedge_delay)
+            if done:
+                return first.result()
+            executor = self.guard.executor
+            if executor is not None and executor.is_saturated():
+                # A second attempt would only queue behind the stuck ones
+                self.guard.metrics.hedges_skipped += 1
+                return await first
+
+            self.guard.metrics.hedged_requests += 1
+            second = asyncio.ensure_future(
+                self.logs_repository.query_logs(**query_params)
+            )
+            pending.add(second)
+            error = None
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        if task is second:
+                            self.guard.metrics.hedged_wins += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def stream_logs(
+        self,
+        cloud_function_name: str,
+        cloud_function_region: str,
+        start_time: datetime,
+        end_time: datetime,
+        query: str = "",
+        severity: str = "DEFAULT",
+        chunk_timeout: float | None = None,
+    ) -> AsyncIterator[LogEntry]:
+        """
+        Stream logs with a deadline per chunk, failing fast while the circuit
+        breaker is open.
+
+        The backend counts as healthy once the first entry arrives, a chunk
+        not arriving within the deadline counts as a failure at any point.
+
+        :param chunk_timeout: (Optional) Seconds a single chunk may take, defaults to the deadline.
+        :return: Async iterator of LogEntry objects.
+        :raises CircuitOpenException: If the circuit breaker is open.
+        :raises CloudLogsTimeoutException: If a chunk does not arrive within the deadline.
+        """
+        circuit_breaker = self.guard.circuit_breaker
+        if not circuit_breaker.allow_request():
+            raise CircuitOpenException("Cloud Logging circuit breaker is open.")
+
+        healthy = False
+        try:
+            async for log in self.logs_repository.stream_logs(
+                cloud_function_name=cloud_function_name,
+                cloud_function_region=cloud_function_region,
+                start_time=start_time,
+                end_time=end_time,
+                query=query,
+                severity=severity,
+                chunk_timeout=chunk_timeout or self.guard.deadline,
+            ):
+                if not healthy:
+                    healthy = True
+                    circuit_breaker.record_success()
+                yield log
+        except (MissingQueryParameterException, InvalidFilterQueryException):
+            healthy = True
+            circuit_breaker.record_success()
+            raise
+        except CloudLogsTimeoutException:
+            healthy = True
+            self.guard.metrics.timeouts += 1
+            circuit_breaker.record_failure()
+            raise
+        except Exception:
+            if not healthy:
+                healthy = True
+                circuit_breaker.record_failure()
+            raise
+        finally:
+            if not healthy:
+                # Empty stream, or cancelled before the first entry
+                circuit_breaker.release()
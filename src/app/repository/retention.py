@@ -0,0 +1,243 @@
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from pydantic import BaseModel, Field
+from sqlalchemy import Engine, delete, or_, update
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, select
+
+from src.app.repository.model import JobLease, Log, LogRollup
+
+import os
+import socket
+import time
+
+
+DEFAULT_ROLLUP_SEVERITY = "DEFAULT"
+RETENTION_LEASE_NAME = "log_retention"
+MAX_BATCH_ATTEMPTS = 3
+
+
+class RetentionConflictException(Exception):
+    """Custom exception for purge batches conflicting with concurrent writers."""
+
+    def __init__(self, message: str):
+        super().__init__(message)
+
+
+def get_utc_now() -> datetime:
+    # Naive UTC, the form stored timestamps are kept in
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class RetentionPolicy(BaseModel):
+    # A zero batch size would never finish a purge, zero days would purge everything
+    retention_days: int = Field(gt=0)
+    batch_size: int = Field(default=1000, gt=0)
+    rollup: bool = False
+    batch_pause_seconds: float = Field(default=0.0, ge=0)
+    lease_seconds: float = Field(default=3600.0, ge=0)
+
+    def get_cutoff(self, now: datetime) -> datetime:
+        """
+        Get the timestamp before which stored log entries are expired.
+
+        :param now: Reference point in time.
+        :return: Expiry cutoff timestamp.
+        """
+        return now - timedelta(days=self.retention_days)
+
+
+class RetentionMetrics(BaseModel):
+    runs: int = 0
+    skipped_runs: int = 0
+    batches: int = 0
+    deleted_rows: int = 0
+    rolled_up_rows: int = 0
+    last_cutoff: datetime | None = None
+    last_run_started: datetime | None = None
+    last_run_finished: datetime | None = None
+    last_run_deleted_rows: int = 0
+    last_error: str | None = None
+
+
+class LogsRetentionRepository:
+    def __init__(
+        self, engine: Engine, policy: RetentionPolicy, owner: str | None = None
+    ):
+        """
+        Initialize the LogsRetentionRepository with a database engine.
+
+        :param engine: Injected SQLAlchemy engine.
+        :param policy: Retention policy to enforce.
+        :param owner: (Optional) Lease owner name, defaults to host and process id.
+        """
+        self.engine = engine
+        self.policy = policy
+        self.owner = owner
+        self.metrics = RetentionMetrics()
+
+    def get_owner(self) -> str:
+        # Resolved on every call, the repository is created before forking workers
+        return self.owner or f"{socket.gethostname()}:{os.getpid()}"
+
+    def acquire_lease(self) -> bool:
+        """
+        Acquire or renew the retention lease, so only one process purges at a time.
+
+        The lease is held for `lease_seconds`; it is not released after a run,
+        so the other workers skip their runs until it expires.
+
+        :return: True if this process holds the lease.
+        """
+        owner = self.get_owner()
+        now = get_utc_now()
+        expires_at = now + timedelta(seconds=self.policy.lease_seconds)
+        with Session(self.engine) as session:
+            result = session.exec(
+                update(JobLease)
+                .where(
+                    JobLease.name == RETENTION_LEASE_NAME,
+                    or_(JobLease.owner == owner, JobLease.expires_at < now),
+                )
+                .values(owner=owner, expires_at=expires_at)
+            )
+            if result.rowcount == 1:
+                session.commit()
+                return True
+            session.rollback()
+
+            session.add(
+                JobLease(name=RETENTION_LEASE_NAME, owner=owner, expires_at=expires_at)
+            )
+            try:
+                session.commit()
+            except IntegrityError:
+                # Held by another process
+                session.rollback()
+                return False
+        return True
+
+    @staticmethod
+    def get_hour_bucket(timestamp: datetime) -> datetime:
+        """
+        Get the hourly time bucket a timestamp belongs to.
+
+        :param timestamp: Timestamp of the log entry.
+        :return: Timestamp truncated to the full hour.
+        """
+        return timestamp.replace(minute=0, second=0, microsecond=0)
+
+    def purge_batch(self, cutoff: datetime) -> int:
+        """
+        Delete (and optionally roll up) a single batch of expired log entries.
+
+        The oldest entries are selected first through the timestamp index and
+        deleted by primary key, so each batch is a short transaction that
+        does not lock the whole table. If a concurrent writer deleted some of
+        the selected entries or created the same rollup row in the meantime,
+        the batch is rolled back and retried, so nothing is rolled up twice.
+
+        :param cutoff: Entries older than this timestamp are expired.
+        :return: Number of deleted entries.
+        :raises RetentionConflictException: If the batch conflicts MAX_BATCH_ATTEMPTS times.
+        """
+        for _ in range(MAX_BATCH_ATTEMPTS):
+            deleted = self.try_purge_batch(cutoff)
+            if deleted is not None:
+                return deleted
+        raise RetentionConflictException(
+            f"Purge batch conflicted with concurrent writers {MAX_BATCH_ATTEMPTS} times."
+        )
+
+    def try_purge_batch(self, cutoff: datetime) -> int | None:
+        """
+        Delete (and optionally roll up) a single batch in its own transaction.
+
+        :param cutoff: Entries older than this timestamp are expired.
+        :return: Number of deleted entries, None if the batch was rolled back.
+        """
+        with Session(self.engine) as session:
+            statement = (
+                select(Log.id, Log.timestamp, Log.severity)
+                .where(Log.timestamp < cutoff)
+                .order_by(Log.timestamp)
+                .limit(self.policy.batch_size)
+            )
+            rows = session.exec(statement).all()
+            if not rows:
+                return 0
+
+            if self.policy.rollup:
+                buckets = Counter(
+                    (
+                        self.get_hour_bucket(timestamp),
+                        severity or DEFAULT_ROLLUP_SEVERITY,
+                    )
+                    for _, timestamp, severity in rows
+                )
+                for (hour, severity), count in buckets.items():
+                    rollup = session.get(LogRollup, (hour, severity))
+                    if rollup is None:
+                        rollup = LogRollup(hour=hour, severity=severity, count=0)
+                    rollup.count += count
+                    session.add(rollup)
+
+            result = session.exec(
+                delete(Log).where(Log.id.in_([row[0] for row in rows]))
+            )
+            if result.rowcount != len(rows):
+                session.rollback()
+                return None
+            try:
+                session.commit()
+            except IntegrityError:
+                # Rollup row created by a concurrent writer
+                session.rollback()
+                return None
+
+        self.metrics.batches += 1
+        self.metrics.deleted_rows += len(rows)
+        if self.policy.rollup:
+            self.metrics.rolled_up_rows += len(rows)
+        return len(rows)
+
+    def purge_expired(self, now: datetime | None = None) -> int:
+        """
+        Delete all expired log entries in bounded-size batches.
+
+        Runs only while this process holds the retention lease, every worker
+        schedules the job but at most one of them purges per lease period.
+
+        :param now: (Optional) Reference point in time, defaults to current UTC time.
+        :return: Number of deleted entries.
+        """
+        if not self.acquire_lease():
+            self.metrics.skipped_runs += 1
+            return 0
+
+        # Stored timestamps are naive UTC, see LogsStore
+        now = now or get_utc_now()
+        cutoff = self.policy.get_cutoff(now)
+        self.metrics.runs += 1
+        self.metrics.last_cutoff = cutoff
+        self.metrics.last_run_started = get_utc_now()
+        self.metrics.last_run_deleted_rows = 0
+        self.metrics.last_error = None
+
+        try:
+            while True:
+                deleted = self.purge_batch(cutoff)
+                self.metrics.last_run_deleted_rows += deleted
+                if deleted < self.policy.batch_size:
+                    break
+                if self.policy.batch_pause_seconds:
+                    time.sleep(self.policy.batch_pause_seconds)
+                if not self.acquire_lease():
+                    # Lease expired mid-run and was taken over
+                    break
+        except Exception as e:
+            self.metrics.last_error = repr(e)
+            raise
+        finally:
+            self.metrics.last_run_finished = get_utc_now()
+        return self.metrics.last_run_deleted_rows
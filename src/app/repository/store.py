@@ -0,0 +1,118 @@
+from datetime import datetime
+from typing import Iterator
+
+from sqlalchemy import func
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlmodel import Session, select
+
+from src.app.repository.domain import LogEntry, to_naive_utc
+from src.app.repository.model import Log
+
+import json
+
+
+INSERT_CHUNK_SIZE = 500
+STREAM_CHUNK_SIZE = 1000
+
+
+class LogsStore:
+    def __init__(self, session: Session):
+        """
+        Initialize the LogsStore with a database session.
+
+        :param session: Injected database Session.
+        """
+        self.session = session
+
+    def _get_insert_ignore_statement(self):
+        match self.session.get_bind().dialect.name:
+            case "sqlite":
+                return sqlite.insert(Log).on_conflict_do_nothing(
+                    index_elements=["insertId"]
+                )
+            case "postgresql":
+                return postgresql.insert(Log).on_conflict_do_nothing(
+                    index_elements=["insertId"]
+                )
+            case _:
+                # MySQL / MariaDB, unlike INSERT IGNORE only the duplicate
+                # key is absorbed, other errors still fail the write
+                return mysql.insert(Log).on_duplicate_key_update(id=Log.id)
+
+    def count_stored(self, insert_ids: list[str]) -> int:
+        """
+        Count the given insertIds that are already stored.
+
+        :param insert_ids: List of insertIds.
+        :return: Number of stored insertIds.
+        """
+        statement = select(func.count()).where(Log.insertId.in_(insert_ids))
+        return self.session.exec(statement).one()
+
+    def insert_ignore_duplicates(self, logs: list[LogEntry]) -> int:
+        """
+        Store log entries, skipping the ones whose insertId is already stored.
+
+        :param logs: List of LogEntry objects with insertId set.
+        :return: Number of newly stored entries.
+        """
+        inserted = 0
+        for i in range(0, len(logs), INSERT_CHUNK_SIZE):
+            rows = [
+                {
+                    "severity": log.severity,
+                    "textPayload": log.textPayload,
+                    "timestamp": to_naive_utc(log.timestamp).replace(microsecond=0),
+                    "resource": json.dumps(log.resource),
+                    "insertId": log.insertId,
+                }
+                for log in logs[i : i + INSERT_CHUNK_SIZE]
+            ]
+            if self.session.get_bind().dialect.name in ("sqlite", "postgresql"):
+                result = self.session.execute(
+                    self._get_insert_ignore_statement().values(rows)
+                )
+                inserted += result.rowcount
+            else:
+                # MySQL reports matched rows (FOUND_ROWS) for the absorbed
+                # duplicates too, count the already stored ones instead
+                stored = self.count_stored([row["insertId"] for row in rows])
+                self.session.execute(self._get_insert_ignore_statement().values(rows))
+                inserted += len(rows) - stored
+        self.session.commit()
+        return inserted
+
+    def stream_logs(
+        self,
+        start_time: datetime,
+        end_time: datetime,
+        severity: str | None = None,
+    ) -> Iterator[LogEntry]:
+        """
+        Stream stored log entries within a given time range.
+
+        Rows are fetched in chunks of STREAM_CHUNK_SIZE, so memory use does
+        not depend on the size of the time range.
+
+        :param start_time: Start of the time range for logs.
+        :param end_time: End of the time range for logs.
+        :param severity: (Optional) Severity of the log entries (e.g., "ERROR").
+        :return: Iterator of LogEntry objects.
+        """
+        statement = (
+            select(Log)
+            .where(Log.timestamp >= start_time, Log.timestamp <= end_time)
+            .order_by(Log.timestamp)
+            .execution_options(yield_per=STREAM_CHUNK_SIZE)
+        )
+        if severity:
+            statement = statement.where(Log.severity == severity)
+        for log in self.session.exec(statement):
+            yield LogEntry(
+                timestamp=log.timestamp,
+                severity=log.severity,
+                textPayload=log.textPayload,
+                resource=json.loads(log.resource) if log.resource else {},
+                insertId=log.insertId,
+            )
+            self.session.expunge(log)
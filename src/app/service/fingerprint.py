@@ -0,0 +1,190 @@
+from hashlib import blake2b
+from typing import AsyncIterable, Iterable
+
+from src.app.repository.domain import LogEntry, LogGroup
+
+import asyncio
+import heapq
+import re
+
+
+# Upper bound of `top_k`, tracked groups and so memory are proportional to it
+MAX_LOG_GROUPS = 1000
+GROUP_CHUNK_SIZE = 1000
+MASKS = (
+    (
+        re.compile(
+            r"\b[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\b"
+        ),
+        "<uuid>",
+    ),
+    (re.compile(r"\b0[xX][0-9a-fA-F]+\b"), "<hex>"),
+    (re.compile(r"\b(?=[0-9a-fA-F]*\d)[0-9a-fA-F]{8,}\b"), "<hex>"),
+    (re.compile(r"\d+(?:\.\d+)?"), "<num>"),
+)
+
+
+def normalize_message(message: str | None) -> str:
+    """
+    Mask the variable parts of a log message: UUIDs, hex values and numbers.
+
+    :param message: Log message.
+    :return: Normalized message pattern.
+    """
+    pattern = message or ""
+    for regex, mask in MASKS:
+        pattern = regex.sub(mask, pattern)
+    return pattern
+
+
+def get_fingerprint(pattern: str) -> str:
+    """
+    Get a short stable fingerprint of a normalized message pattern.
+
+    :param pattern: Normalized message pattern.
+    :return: Hex fingerprint.
+    """
+    return blake2b(pattern.encode(), digest_size=8).hexdigest()
+
+
+class GroupCounter:
+    __slots__ = ("pattern", "count", "count_error", "first_seen", "last_seen", "sample")
+
+    def __init__(self, pattern: str, count: int, count_error: int, sample: LogEntry):
+        # Plain mutable counter, updating pydantic models per entry is too slow
+        self.pattern = pattern
+        self.count = count
+        self.count_error = count_error
+        self.first_seen = sample.timestamp
+        self.last_seen = sample.timestamp
+        self.sample = sample
+
+    def get_log_group(self) -> LogGroup:
+        return LogGroup(
+            fingerprint=get_fingerprint(self.pattern),
+            pattern=self.pattern,
+            count=self.count,
+            count_error=self.count_error,
+            first_seen=self.first_seen,
+            last_seen=self.last_seen,
+            sample=self.sample,
+        )
+
+
+class TopKLogGroups:
+    def __init__(self, top_k: int, capacity: int | None = None):
+        """
+        Streaming top-K of log groups, using the Space-Saving algorithm.
+
+        At most `capacity` groups are tracked. When a new pattern arrives and
+        all slots are taken, the smallest group is replaced and the new one
+        inherits its count, recorded as `count_error`. Any group with more
+        than N / capacity entries is guaranteed to be kept. The smallest
+        group is found through a min-heap of counts, refreshed lazily, so
+        adding an entry takes amortized O(log capacity).
+
+        :param top_k: Number of groups to return.
+        :param capacity: (Optional) Number of tracked groups, defaults to 10 * top_k.
+        """
+        if top_k <= 0:
+            raise ValueError("Number of log groups must be positive")
+        self.top_k = top_k
+        self.capacity = max(capacity or top_k * 10, top_k)
+        self.groups: dict[str, GroupCounter] = {}
+        # (count, pattern) per tracked group, counts may lag behind the groups
+        self._heap: list[tuple[int, str]] = []
+        self.total = 0
+
+    def add(self, log: LogEntry) -> None:
+        """
+        Count a log entry into its group.
+
+        :param log: LogEntry object.
+        """
+        self.total += 1
+        pattern = normalize_message(log.textPayload)
+        group = self.groups.get(pattern)
+        if group is not None:
+            group.count += 1
+            if log.timestamp < group.first_seen:
+                group.first_seen = log.timestamp
+            elif log.timestamp > group.last_seen:
+                group.last_seen = log.timestamp
+            return
+
+        count = 1
+        count_error = 0
+        if len(self.groups) >= self.capacity:
+            count_error = self.pop_smallest().count
+            count += count_error
+        self.groups[pattern] = GroupCounter(pattern, count, count_error, log)
+        heapq.heappush(self._heap, (count, pattern))
+
+    def add_all(self, logs: Iterable[LogEntry]) -> None:
+        """
+        Count log entries into their groups.
+
+        :param logs: Iterable of LogEntry objects.
+        """
+        for log in logs:
+            self.add(log)
+
+    def pop_smallest(self) -> GroupCounter:
+        """
+        Remove the tracked group with the smallest count.
+
+        :return: Removed GroupCounter.
+        """
+        while True:
+            count, pattern = self._heap[0]
+            group = self.groups[pattern]
+            if group.count == count:
+                heapq.heappop(self._heap)
+                return self.groups.pop(pattern)
+            # Stale count, the group grew since it was pushed
+            heapq.heapreplace(self._heap, (group.count, pattern))
+
+    def get_top(self) -> list[LogGroup]:
+        """
+        Get the largest log groups.
+
+        :return: Up to `top_k` LogGroup objects, largest first.
+        """
+        groups = sorted(self.groups.values(), key=lambda group: -group.count)
+        return [group.get_log_group() for group in groups[: self.top_k]]
+
+
+def group_logs(logs: Iterable[LogEntry], top_k: int) -> list[LogGroup]:
+    """
+    Group a stream of log entries by message fingerprint.
+
+    :param logs: Iterable of LogEntry objects.
+    :param top_k: Number of groups to return.
+    :return: List of the largest LogGroup objects.
+    """
+    groups = TopKLogGroups(top_k)
+    groups.add_all(logs)
+    return groups.get_top()
+
+
+async def group_logs_async(logs: AsyncIterable[LogEntry], top_k: int) -> list[LogGroup]:
+    """
+    Group an async stream of log entries by message fingerprint.
+
+    Entries are normalized and counted in chunks of GROUP_CHUNK_SIZE in a
+    worker thread, the regular expressions would block the event loop.
+
+    :param logs: Async iterable of LogEntry objects.
+    :param top_k: Number of groups to return.
+    :return: List of the largest LogGroup objects.
+    """
+    groups = TopKLogGroups(top_k)
+    chunk: list[LogEntry] = []
+    async for log in logs:
+        chunk.append(log)
+        if len(chunk) >= GROUP_CHUNK_SIZE:
+            await asyncio.to_thread(groups.add_all, chunk)
+            chunk = []
+    if chunk:
+        await asyncio.to_thread(groups.add_all, chunk)
+    return groups.get_top()
@@ -0,0 +1,48 @@
+from src.app.repository.domain import IngestResult, LogEntry
+from src.app.repository.store import LogsStore
+from src.pkg.bloom import BloomFilter
+
+
+class LogsIngestionService:
+    def __init__(self, logs_store: LogsStore, seen_filter: BloomFilter):
+        self.logs_store: LogsStore = logs_store
+        self.seen_filter: BloomFilter = seen_filter
+
+    def ingest(self, logs: list[LogEntry]) -> IngestResult:
+        """
+        Store log entries idempotently.
+
+        Every entry gets its insertId resolved; repeats within the batch and
+        entries already seen by the bloom filter are dropped before reaching
+        the database, the rest is absorbed by the unique insertId index.
+        Bloom filter skips are reported separately as probable duplicates,
+        as a false positive (see DEDUP_BLOOM_ERROR_RATE) drops a new entry.
+
+        :param logs: List of LogEntry objects to be stored.
+        :return: IngestResult with received, inserted and duplicate counts.
+        """
+        pending: dict[str, LogEntry] = {}
+        received: set[str] = set()
+        probable_duplicates = 0
+        for log in logs:
+            insert_id = log.get_insert_id()
+            if insert_id in received:
+                continue
+            received.add(insert_id)
+            if insert_id in self.seen_filter:
+                probable_duplicates += 1
+                continue
+            pending[insert_id] = log.model_copy(update={"insertId": insert_id})
+
+        inserted = 0
+        if pending:
+            inserted = self.logs_store.insert_ignore_duplicates(list(pending.values()))
+            for insert_id in pending:
+                self.seen_filter.add(insert_id)
+
+        return IngestResult(
+            received=len(logs),
+            inserted=inserted,
+            duplicates=len(logs) - inserted - probable_duplicates,
+            probable_duplicates=probable_duplicates,
+        )
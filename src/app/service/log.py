@@ -1,14 +1,36 @@
 from datetime import datetime
+from pydantic import TypeAdapter
 
-from src.app.repository.domain import CloudLogsInterface, LogEntry
+from src.app.repository.domain import CloudLogsInterface, LogEntry, LogGroup
+from src.app.repository.log import CloudLogsUnavailableException
+from src.app.repository.resilient import CloudLogsGuardMetrics
+from src.app.service.fingerprint import group_logs_async
+from src.pkg.cache import SharedQueryCache
+
+import asyncio
+import json
+
+
+LOG_ENTRIES_ADAPTER = TypeAdapter(list[LogEntry])
+CACHE_POLL_INTERVAL_SECONDS = 0.05
 
 
 class LogsService:
     def __init__(
         self,
         logs_repository: CloudLogsInterface,
+        query_cache: SharedQueryCache | None = None,
+        cache_ttl: float = 30.0,
+        cache_lease: float = 60.0,
+        metrics: CloudLogsGuardMetrics | None = None,
     ):
         self.logs_repository: CloudLogsInterface = logs_repository
+        self.query_cache: SharedQueryCache | None = query_cache
+        self.cache_ttl: float = cache_ttl
+        self.cache_lease: float = cache_lease
+        self.metrics: CloudLogsGuardMetrics | None = metrics
+        # Set when the last result was served stale, the service lives per request
+        self.served_stale: bool = False
 
     async def get_logs(
         self,
@@ -19,7 +41,7 @@ class LogsService:
         query: str = "",
         severity: str = "DEFAULT",
     ) -> list[LogEntry]:
-        logs = await self.logs_repository.query_logs(
+        query_params = dict(
             cloud_function_name=cloud_function_name,
             cloud_function_region=cloud_function_region,
             start_time=start_time,
@@ -27,4 +49,70 @@ class LogsService:
             query=query,
             severity=severity,
         )
+        if self.query_cache is None:
+            return await self.logs_repository.query_logs(**query_params)
+        return await self.get_cached_logs(query_params)
+
+    async def get_log_groups(
+        self,
+        cloud_function_name: str,
+        cloud_function_region: str,
+        start_time: datetime,
+        end_time: datetime,
+        query: str = "",
+        severity: str = "DEFAULT",
+        top_k: int = 10,
+    ) -> list[LogGroup]:
+        logs = self.logs_repository.stream_logs(
+            cloud_function_name=cloud_function_name,
+            cloud_function_region=cloud_function_region,
+            start_time=start_time,
+            end_time=end_time,
+            query=query,
+            severity=severity,
+        )
+        return await group_logs_async(logs, top_k=top_k)
+
+    @staticmethod
+    def get_cache_key(query_params: dict) -> str:
+        return json.dumps(query_params, sort_keys=True, default=str)
+
+    async def get_cached_logs(self, query_params: dict) -> list[LogEntry]:
+        """
+        Query logs through the shared cache.
+
+        Only one worker queries the repository for a given set of parameters,
+        the others wait for its result to appear in the cache. Results too
+        large for a cache slot are queried by the waiting workers on their own.
+        When the backend is unavailable, the expired cached result is served
+        as stale, without being cached again.
+
+        :param query_params: Keyword arguments of the repository query.
+        :return: List of LogEntry objects.
+        :raises CloudLogsUnavailableException: If the backend fails and no stale result exists.
+        """
+        key = self.get_cache_key(query_params)
+        while True:
+            cached = self.query_cache.get(key)
+            if cached is not None:
+                return LOG_ENTRIES_ADAPTER.validate_json(cached)
+            if self.query_cache.claim(key, lease=self.cache_lease):
+                break
+            await asyncio.sleep(CACHE_POLL_INTERVAL_SECONDS)
+
+        try:
+            logs = await self.logs_repository.query_logs(**query_params)
+        except CloudLogsUnavailableException:
+            stale = self.query_cache.get_stale(key)
+            self.query_cache.release(key)
+            if stale is None:
+                raise
+            self.served_stale = True
+            if self.metrics is not None:
+                self.metrics.stale_results_served += 1
+            return LOG_ENTRIES_ADAPTER.validate_json(stale)
+        except BaseException:
+            self.query_cache.release(key)
+            raise
+        self.query_cache.set(key, LOG_ENTRIES_ADAPTER.dump_json(logs), ttl=self.cache_ttl)
         return logs
@@ -0,0 +1,39 @@
+from src.app.repository.retention import LogsRetentionRepository, RetentionMetrics
+
+import asyncio
+import logging
+
+
+logger = logging.getLogger(__name__)
+
+
+class RetentionService:
+    def __init__(
+        self,
+        retention_repository: LogsRetentionRepository,
+        interval_seconds: float,
+    ):
+        self.retention_repository: LogsRetentionRepository = retention_repository
+        self.interval_seconds: float = interval_seconds
+
+    async def run_once(self) -> int:
+        """
+        Purge expired log entries without blocking the event loop.
+
+        :return: Number of deleted entries.
+        """
+        return await asyncio.to_thread(self.retention_repository.purge_expired)
+
+    async def run_periodically(self) -> None:
+        """
+        Purge expired log entries every `interval_seconds` until cancelled.
+        """
+        while True:
+            try:
+                await self.run_once()
+            except Exception:
+                logger.exception("Log retention run failed")
+            await asyncio.sleep(self.interval_seconds)
+
+    def get_metrics(self) -> RetentionMetrics:
+        return self.retention_repository.metrics
@@ -0,0 +1,60 @@
+from hashlib import blake2b
+
+import math
+import threading
+
+
+class BloomFilter:
+    def __init__(self, capacity: int, error_rate: float):
+        """
+        Initialize a bounded, thread-safe bloom filter.
+
+        Two generations of bits are kept: once `capacity` keys were added to
+        the current generation it becomes the previous one and a fresh one is
+        started, so memory stays bounded while recently seen keys are kept.
+
+        :param capacity: Number of keys per generation.
+        :param error_rate: Target false positive rate per generation.
+        """
+        if capacity <= 0 or not 0 < error_rate < 1:
+            raise ValueError("Bloom filter capacity and error rate are out of range")
+        self.capacity = capacity
+        self.size = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._current = bytearray(math.ceil(self.size / 8))
+        self._previous = bytearray(len(self._current))
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def _get_positions(self, key: str) -> list[int]:
+        digest = blake2b(key.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return [(first + i * second) % self.size for i in range(self.hash_count)]
+
+    @staticmethod
+    def _is_set(bits: bytearray, positions: list[int]) -> bool:
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in positions)
+
+    def add(self, key: str) -> None:
+        """
+        Add a key to the filter.
+
+        :param key: Key to add.
+        """
+        positions = self._get_positions(key)
+        with self._lock:
+            if self._count >= self.capacity:
+                self._previous = self._current
+                self._current = bytearray(len(self._previous))
+                self._count = 0
+            for position in positions:
+                self._current[position >> 3] |= 1 << (position & 7)
+            self._count += 1
+
+    def __contains__(self, key: str) -> bool:
+        positions = self._get_positions(key)
+        with self._lock:
+            return self._is_set(self._current, positions) or self._is_set(
+                self._previous, positions
+            )
@@ -0,0 +1,238 @@
+from contextlib import contextmanager
+from hashlib import blake2b
+from typing import Iterator
+
+import logging
+import mmap
+import multiprocessing
+import struct
+import time
+
+
+# digest, state, expires_at, lease_until, length
+SLOT_HEADER = struct.Struct("<16sBddI")
+SLOT_EMPTY = 0
+SLOT_READY = 1
+SLOT_PENDING = 2
+SLOT_TOO_LARGE = 3
+
+logger = logging.getLogger(__name__)
+
+
+class SharedQueryCache:
+    def __init__(
+        self,
+        slots: int = 256,
+        slot_size: int = 256 * 1024,
+        lock_timeout: float = 0.1,
+    ):
+        """
+        Initialize a fixed-size cache living in an anonymous shared memory map.
+
+        The cache must be created before the worker processes are forked, so
+        every worker maps the same memory and sees the values stored by the
+        others. Keys are hashed to a slot, a newer key evicts the older one,
+        unless the older one is still being computed. Expired values are kept
+        until evicted, so they can be served as stale results.
+
+        :param slots: Number of cache slots.
+        :param slot_size: Size of a single slot in bytes, larger values are not
+            cached but marked as too large, so nobody waits for them.
+        :param lock_timeout: Seconds to wait for the lock shared by the workers.
+            It is held for a slot copy only, a timeout means its holder was
+            killed, and the cache is bypassed by this worker from then on.
+        """
+        if slots <= 0 or slot_size <= SLOT_HEADER.size:
+            raise ValueError("Shared cache slots and slot size are out of range")
+        self.slots = slots
+        self.slot_size = slot_size
+        self.max_value_size = slot_size - SLOT_HEADER.size
+        self._memory = mmap.mmap(-1, slots * slot_size)
+        self.lock_timeout = lock_timeout
+        self._lock = multiprocessing.get_context("fork").Lock()
+        self._lock_lost = False
+
+    @contextmanager
+    def _locked(self) -> Iterator[bool]:
+        """
+        Hold the shared lock, unless it cannot be acquired within `lock_timeout`.
+
+        A worker killed while holding the lock (e.g. by the OOM killer) never
+        releases it, the callers run on the event loop and must not block on it.
+
+        :return: Context manager yielding True if the lock is held, False if the
+            cache has to be bypassed.
+        """
+        if self._lock_lost:
+            yield False
+            return
+        if not self._lock.acquire(timeout=self.lock_timeout):
+            logger.error(
+                "Shared query cache lock not acquired within %s seconds, bypassing the cache",
+                self.lock_timeout,
+            )
+            self._lock_lost = True
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            self._lock.release()
+
+    @staticmethod
+    def _get_digest(key: str) -> bytes:
+        return blake2b(key.encode(), digest_size=16).digest()
+
+    def _get_offset(self, digest: bytes) -> int:
+        return int.from_bytes(digest[:8], "little") % self.slots * self.slot_size
+
+    def _read_header(self, offset: int) -> tuple[bytes, int, float, float, int]:
+        return SLOT_HEADER.unpack_from(self._memory, offset)
+
+    def _write_header(
+        self,
+        offset: int,
+        digest: bytes,
+        state: int,
+        expires_at: float = 0.0,
+        lease_until: float = 0.0,
+        length: int = 0,
+    ) -> None:
+        SLOT_HEADER.pack_into(
+            self._memory, offset, digest, state, expires_at, lease_until, length
+        )
+
+    def get(self, key: str) -> bytes | None:
+        """
+        Get a cached value.
+
+        :param key: Cache key.
+        :return: Cached value, or None if it is missing or expired.
+        """
+        digest = self._get_digest(key)
+        offset = self._get_offset(digest)
+        with self._locked() as locked:
+            if not locked:
+                return None
+            slot_digest, state, expires_at, _, length = self._read_header(offset)
+            if slot_digest != digest or state != SLOT_READY or expires_at < time.time():
+                return None
+            start = offset + SLOT_HEADER.size
+            return self._memory[start : start + length]
+
+    def get_stale(self, key: str) -> bytes | None:
+        """
+        Get a cached value, even if it is expired or being recomputed.
+
+        :param key: Cache key.
+        :return: Last stored value, or None if it was evicted.
+        """
+        digest = self._get_digest(key)
+        offset = self._get_offset(digest)
+        with self._locked() as locked:
+            if not locked:
+                return None
+            slot_digest, state, _, _, length = self._read_header(offset)
+            if (
+                slot_digest != digest
+                or state not in (SLOT_READY, SLOT_PENDING)
+                or not length
+            ):
+                return None
+            start = offset + SLOT_HEADER.size
+            return self._memory[start : start + length]
+
+    def set(self, key: str, value: bytes, ttl: float) -> bool:
+        """
+        Store a value for `ttl` seconds.
+
+        :param key: Cache key.
+        :param value: Value to be cached.
+        :param ttl: Time to live in seconds.
+        :return: True if the value was stored, False if it does not fit in a slot
+            or the slot is claimed for another key.
+        """
+        digest = self._get_digest(key)
+        offset = self._get_offset(digest)
+        now = time.time()
+        with self._locked() as locked:
+            if not locked:
+                return False
+            slot_digest, state, _, lease_until, _ = self._read_header(offset)
+            if slot_digest != digest and state == SLOT_PENDING and lease_until >= now:
+                return False
+            if len(value) > self.max_value_size:
+                # Let the workers waiting for this key compute it on their own
+                self._write_header(offset, digest, SLOT_TOO_LARGE, expires_at=now + ttl)
+                return False
+            start = offset + SLOT_HEADER.size
+            self._memory[start : start + len(value)] = value
+            self._write_header(
+                offset, digest, SLOT_READY, expires_at=now + ttl, length=len(value)
+            )
+        return True
+
+    def claim(self, key: str, lease: float) -> bool:
+        """
+        Claim the right to compute a missing value, so other workers wait for it.
+
+        Values known to be too large for a slot, and keys whose slot is
+        claimed for another key, are granted without a claim: every worker
+        computes them on its own instead of queueing behind each other.
+
+        :param key: Cache key.
+        :param lease: Seconds after which an unfinished claim can be taken over.
+        :return: True if the value should be computed, False if a valid value or claim exists.
+        """
+        digest = self._get_digest(key)
+        offset = self._get_offset(digest)
+        now = time.time()
+        with self._locked() as locked:
+            if not locked:
+                return True
+            slot_digest, state, expires_at, lease_until, length = self._read_header(
+                offset
+            )
+            if slot_digest == digest:
+                if state == SLOT_READY and expires_at >= now:
+                    return False
+                if state == SLOT_PENDING and lease_until >= now:
+                    return False
+                if state == SLOT_TOO_LARGE and expires_at >= now:
+                    return True
+            elif state == SLOT_PENDING and lease_until >= now:
+                return True
+            if slot_digest != digest or state not in (SLOT_READY, SLOT_PENDING):
+                expires_at, length = 0.0, 0
+            # The expired value stays readable as a stale result
+            self._write_header(
+                offset,
+                digest,
+                SLOT_PENDING,
+                expires_at=expires_at,
+                lease_until=now + lease,
+                length=length,
+            )
+        return True
+
+    def release(self, key: str) -> None:
+        """
+        Release an unfinished claim.
+
+        :param key: Cache key.
+        """
+        digest = self._get_digest(key)
+        offset = self._get_offset(digest)
+        with self._locked() as locked:
+            if not locked:
+                return
+            slot_digest, state, expires_at, _, length = self._read_header(offset)
+            if slot_digest == digest and state == SLOT_PENDING:
+                # Back to the expired value, if there was one
+                self._write_header(
+                    offset,
+                    digest,
+                    SLOT_READY if length else SLOT_EMPTY,
+                    expires_at=expires_at,
+                    length=length,
+                )
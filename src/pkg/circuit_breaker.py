@@ -0,0 +1,91 @@
+from datetime import datetime
+from enum import Enum
+from pydantic import BaseModel
+
+import time
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreakerMetrics(BaseModel):
+    state: CircuitState = CircuitState.CLOSED
+    successes: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+    rejected: int = 0
+    opened: int = 0
+    last_opened_at: datetime | None = None
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """
+        Initialize a circuit breaker.
+
+        After `failure_threshold` consecutive failures the circuit opens and
+        requests are rejected. After `reset_timeout` seconds a single probe
+        request is let through (half-open): its success closes the circuit,
+        its failure opens it again.
+
+        :param failure_threshold: Consecutive failures that open the circuit.
+        :param reset_timeout: Seconds to wait before probing an open circuit.
+        """
+        if failure_threshold <= 0 or reset_timeout < 0:
+            raise ValueError("Circuit breaker threshold and timeout are out of range")
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.metrics = CircuitBreakerMetrics()
+        self._opened_at = 0.0
+        self._probing = False
+
+    def get_state(self) -> CircuitState:
+        return self.metrics.state
+
+    def allow_request(self) -> bool:
+        """
+        Check whether a request may be sent to the protected backend.
+
+        :return: True if the request may be sent, False if it should fail fast.
+        """
+        if self.metrics.state == CircuitState.OPEN:
+            if time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.metrics.state = CircuitState.HALF_OPEN
+                self._probing = False
+        if self.metrics.state == CircuitState.HALF_OPEN and not self._probing:
+            self._probing = True
+            return True
+        if self.metrics.state == CircuitState.CLOSED:
+            return True
+        self.metrics.rejected += 1
+        return False
+
+    def record_success(self) -> None:
+        self.metrics.successes += 1
+        self.metrics.consecutive_failures = 0
+        self.metrics.state = CircuitState.CLOSED
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self.metrics.failures += 1
+        self.metrics.consecutive_failures += 1
+        if self.metrics.state == CircuitState.OPEN:
+            return
+        if (
+            self.metrics.state == CircuitState.HALF_OPEN
+            or self.metrics.consecutive_failures >= self.failure_threshold
+        ):
+            self.metrics.state = CircuitState.OPEN
+            self.metrics.opened += 1
+            self.metrics.last_opened_at = datetime.now()
+            self._opened_at = time.monotonic()
+            self._probing = False
+
+    def release(self) -> None:
+        """
+        Release a half-open probe that ended without a result, e.g. when cancelled.
+        """
+        self._probing = False
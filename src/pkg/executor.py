@@ -0,0 +1,58 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable
+
+import asyncio
+import threading
+
+
+class BoundedExecutor:
+    def __init__(self, max_workers: int, thread_name_prefix: str = ""):
+        """
+        Initialize a dedicated thread pool that keeps track of its load.
+
+        Blocking calls run here instead of the event loop's default executor,
+        so calls stuck on a slow backend cannot starve unrelated work.
+
+        :param max_workers: Number of threads.
+        :param thread_name_prefix: (Optional) Prefix of the thread names.
+        """
+        if max_workers <= 0:
+            raise ValueError("Number of executor workers must be positive")
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=thread_name_prefix
+        )
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    def get_in_flight(self) -> int:
+        """
+        Get the number of submitted calls that have not finished yet.
+
+        Calls keep running after the coroutine awaiting them was cancelled,
+        they are counted until their thread returns.
+
+        :return: Number of queued or running calls.
+        """
+        return self._in_flight
+
+    def is_saturated(self) -> bool:
+        return self._in_flight >= self.max_workers
+
+    def _on_done(self, future: Future) -> None:
+        with self._lock:
+            self._in_flight -= 1
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run a blocking call in the pool without blocking the event loop.
+
+        :param func: Blocking callable.
+        :param args: Positional arguments of the callable.
+        :return: Result of the call.
+        """
+        with self._lock:
+            self._in_flight += 1
+        future = self._executor.submit(func, *args)
+        future.add_done_callback(self._on_done)
+        return await asyncio.wrap_future(future)
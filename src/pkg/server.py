@@ -0,0 +1,148 @@
+from fastapi import FastAPI
+
+import logging
+import os
+import signal
+import time
+import uvicorn
+
+
+logger = logging.getLogger(__name__)
+
+# Exit code of a worker whose lifespan startup failed
+STARTUP_FAILURE_EXIT_CODE = 3
+# Workers exiting sooner than this after being forked count as failed to start
+MIN_WORKER_UPTIME_SECONDS = 1.0
+MAX_RESPAWN_BACKOFF_SECONDS = 30.0
+
+
+class WorkerStartupException(Exception):
+    """Custom exception for workers repeatedly failing to start."""
+
+    def __init__(self, message: str):
+        super().__init__(message)
+
+
+def run_worker(config: uvicorn.Config, sockets: list) -> bool:
+    """
+    Run a single uvicorn server on already bound sockets, in a forked child.
+
+    :return: False if the server failed to start, e.g. its lifespan raised.
+    """
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    server = uvicorn.Server(config)
+    server.run(sockets=sockets)
+    # uvicorn returns normally when the lifespan startup fails
+    return server.started
+
+
+def signal_worker(pid: int, signum: int) -> None:
+    try:
+        os.kill(pid, signum)
+    except ProcessLookupError:
+        pass
+
+
+def serve(
+    app: FastAPI,
+    host: str,
+    port: int,
+    workers: int,
+    max_startup_failures: int = 5,
+    respawn_backoff_seconds: float = 0.5,
+) -> None:
+    """
+    Serve a preloaded app with a pre-fork pool of uvicorn workers.
+
+    The app (and anything created with it, like a shared cache) is built once
+    in the master process and inherited by every forked worker. The workers
+    run on uvloop and httptools and share a single listening socket. Workers
+    that die unexpectedly are restarted, with an exponential backoff while
+    they keep failing to start.
+
+    :param app: Preloaded FastAPI app.
+    :param host: Host to bind to.
+    :param port: Port to bind to.
+    :param workers: Number of worker processes.
+    :param max_startup_failures: Consecutive failed starts after which serving stops.
+    :param respawn_backoff_seconds: Delay before restarting after the first failed start.
+    :raises WorkerStartupException: If workers fail to start `max_startup_failures` times in a row.
+    """
+    config = uvicorn.Config(
+        app, host=host, port=port, loop="uvloop", http="httptools", lifespan="on"
+    )
+    sockets = [config.bind_socket()]
+    children: dict[int, float] = {}
+    shutting_down = False
+    startup_failures = 0
+
+    def spawn() -> None:
+        pid = os.fork()
+        if pid == 0:
+            exit_code = 1
+            try:
+                started = run_worker(config, sockets)
+                exit_code = 0 if started else STARTUP_FAILURE_EXIT_CODE
+            except BaseException:
+                logger.exception("Worker %d crashed", os.getpid())
+            finally:
+                os._exit(exit_code)
+        children[pid] = time.monotonic()
+
+    def shutdown(signum, frame) -> None:
+        nonlocal shutting_down
+        shutting_down = True
+        for pid in children:
+            signal_worker(pid, signal.SIGTERM)
+
+    signal.signal(signal.SIGINT, shutdown)
+    signal.signal(signal.SIGTERM, shutdown)
+
+    for _ in range(workers):
+        spawn()
+    logger.info("Started %d workers on %s:%d", workers, host, port)
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+        uptime = time.monotonic() - children.pop(pid, 0.0)
+        if shutting_down:
+            continue
+
+        exit_code = os.waitstatus_to_exitcode(status)
+        if (
+            exit_code == STARTUP_FAILURE_EXIT_CODE
+            or uptime < MIN_WORKER_UPTIME_SECONDS
+        ):
+            startup_failures += 1
+        else:
+            startup_failures = 0
+        if startup_failures >= max_startup_failures:
+            logger.error("Workers failed to start %d times, stopping", startup_failures)
+            shutdown(None, None)
+            continue
+
+        delay = 0.0
+        if startup_failures:
+            delay = min(
+                respawn_backoff_seconds * 2 ** (startup_failures - 1),
+                MAX_RESPAWN_BACKOFF_SECONDS,
+            )
+        logger.warning(
+            "Worker %d exited with code %d, restarting in %.1fs", pid, exit_code, delay
+        )
+        time.sleep(delay)
+        if not shutting_down:
+            spawn()
+
+    for sock in sockets:
+        sock.close()
+    if startup_failures >= max_startup_failures:
+        raise WorkerStartupException(
+            f"Workers failed to start {startup_failures} times in a row."
+        )
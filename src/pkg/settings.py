@@ -4,6 +4,22 @@ import os
 
 DEFALUT_SERVICE_ACCOUNT_CREDENTIALS_ENV_VAR = "GOOGLE_SERVICE_ACCOUNT_CREDENTIALS_PATH"
 MYSQL_CONNECTION_STRING_ENV_VAR = "MYSQL_CONNECTION_STRING"
+LOG_RETENTION_DAYS_ENV_VAR = "LOG_RETENTION_DAYS"
+LOG_RETENTION_BATCH_SIZE_ENV_VAR = "LOG_RETENTION_BATCH_SIZE"
+LOG_RETENTION_ROLLUP_ENV_VAR = "LOG_RETENTION_ROLLUP"
+LOG_RETENTION_INTERVAL_SECONDS_ENV_VAR = "LOG_RETENTION_INTERVAL_SECONDS"
+DEDUP_BLOOM_CAPACITY_ENV_VAR = "DEDUP_BLOOM_CAPACITY"
+DEDUP_BLOOM_ERROR_RATE_ENV_VAR = "DEDUP_BLOOM_ERROR_RATE"
+QUERY_CACHE_TTL_SECONDS_ENV_VAR = "QUERY_CACHE_TTL_SECONDS"
+QUERY_CACHE_SLOTS_ENV_VAR = "QUERY_CACHE_SLOTS"
+QUERY_CACHE_SLOT_SIZE_ENV_VAR = "QUERY_CACHE_SLOT_SIZE"
+SERVER_WORKERS_ENV_VAR = "SERVER_WORKERS"
+FAST_START_ENV_VAR = "FAST_START"
+CLOUD_LOGS_DEADLINE_SECONDS_ENV_VAR = "CLOUD_LOGS_DEADLINE_SECONDS"
+CLOUD_LOGS_HEDGE_DELAY_SECONDS_ENV_VAR = "CLOUD_LOGS_HEDGE_DELAY_SECONDS"
+CIRCUIT_BREAKER_FAILURE_THRESHOLD_ENV_VAR = "CIRCUIT_BREAKER_FAILURE_THRESHOLD"
+CIRCUIT_BREAKER_RESET_SECONDS_ENV_VAR = "CIRCUIT_BREAKER_RESET_SECONDS"
+CLOUD_LOGS_MAX_WORKERS_ENV_VAR = "CLOUD_LOGS_MAX_WORKERS"
 
 
 class Settings(BaseSettings):
@@ -11,6 +27,34 @@ class Settings(BaseSettings):
         DEFALUT_SERVICE_ACCOUNT_CREDENTIALS_ENV_VAR
     )
     mysql_connection_string: str | None = os.getenv(MYSQL_CONNECTION_STRING_ENV_VAR)
+    log_retention_days: int | None = os.getenv(LOG_RETENTION_DAYS_ENV_VAR)
+    log_retention_batch_size: int = os.getenv(LOG_RETENTION_BATCH_SIZE_ENV_VAR, 1000)
+    log_retention_rollup: bool = os.getenv(LOG_RETENTION_ROLLUP_ENV_VAR, False)
+    log_retention_interval_seconds: float = os.getenv(
+        LOG_RETENTION_INTERVAL_SECONDS_ENV_VAR, 3600
+    )
+    dedup_bloom_capacity: int = os.getenv(DEDUP_BLOOM_CAPACITY_ENV_VAR, 100_000)
+    # Share of new log entries wrongly skipped as already seen by POST /log(s),
+    # i.e. lost, reported as `probable_duplicates`
+    dedup_bloom_error_rate: float = os.getenv(DEDUP_BLOOM_ERROR_RATE_ENV_VAR, 1e-6)
+    query_cache_ttl_seconds: float = os.getenv(QUERY_CACHE_TTL_SECONDS_ENV_VAR, 30)
+    query_cache_slots: int = os.getenv(QUERY_CACHE_SLOTS_ENV_VAR, 256)
+    query_cache_slot_size: int = os.getenv(QUERY_CACHE_SLOT_SIZE_ENV_VAR, 256 * 1024)
+    server_workers: int = os.getenv(SERVER_WORKERS_ENV_VAR, os.cpu_count() or 1)
+    fast_start: bool = os.getenv(FAST_START_ENV_VAR, False)
+    cloud_logs_deadline_seconds: float = os.getenv(
+        CLOUD_LOGS_DEADLINE_SECONDS_ENV_VAR, 30
+    )
+    cloud_logs_hedge_delay_seconds: float | None = os.getenv(
+        CLOUD_LOGS_HEDGE_DELAY_SECONDS_ENV_VAR
+    )
+    circuit_breaker_failure_threshold: int = os.getenv(
+        CIRCUIT_BREAKER_FAILURE_THRESHOLD_ENV_VAR, 5
+    )
+    circuit_breaker_reset_seconds: float = os.getenv(
+        CIRCUIT_BREAKER_RESET_SECONDS_ENV_VAR, 30
+    )
+    cloud_logs_max_workers: int = os.getenv(CLOUD_LOGS_MAX_WORKERS_ENV_VAR, 16)
 
     def __init__(self):
         super().__init__()
@@ -28,3 +72,9 @@ class Settings(BaseSettings):
 
     def get_mysql_connection_string(self) -> str | None:
         return self.mysql_connection_string
+
+    def set_log_retention_days(self, log_retention_days: int | None) -> None:
+        self.log_retention_days = log_retention_days
+
+    def get_log_retention_days(self) -> int | None:
+        return self.log_retention_days
@@ -0,0 +1,261 @@
+"""
+Load-testing harness for the logs reader API.
+
+Drives the real `api_factory` app in-process with a fake Cloud Logging client
+and a SQLite database, at a controlled concurrency, and saves throughput,
+latency percentiles and peak RSS as JSON so runs can be compared across commits.
+Every scenario runs in its own process, so its peak RSS is not inflated by
+the scenarios before it.
+
+    python -m tests.benchmark.bench_api --requests 500 --concurrency 16
+    python -m tests.benchmark.bench_api --compare bench_output/<commit>.json
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any, Callable
+
+from httpx import ASGITransport, AsyncClient
+
+import argparse
+import asyncio
+import itertools
+import json
+import resource
+import statistics
+import subprocess
+import tempfile
+import time
+
+from main import api_factory
+from src.pkg.settings import Settings
+from tests.fake_logging import FakeLoggingClient
+
+
+SCENARIOS = ("logs", "log_write", "log_read")
+
+
+def get_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def get_peak_rss_mb() -> float:
+    # ru_maxrss is the high-water mark of the process, reported in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def get_rss_mb() -> float:
+    try:
+        with open("/proc/self/statm") as statm:
+            pages = int(statm.read().split()[1])
+    except OSError:
+        # Not on Linux, fall back to the high-water mark
+        return get_peak_rss_mb()
+    return pages * resource.getpagesize() / 1024 / 1024
+
+
+def percentile(latencies: list[float], percent: float) -> float:
+    if len(latencies) < 2:
+        return latencies[0] if latencies else 0.0
+    return statistics.quantiles(latencies, n=100, method="inclusive")[
+        int(percent) - 1
+    ]
+
+
+async def run_scenario(
+    client: AsyncClient,
+    make_request: Callable[[AsyncClient, int], Any],
+    requests: int,
+    concurrency: int,
+) -> dict[str, Any]:
+    """
+    Send `requests` requests with at most `concurrency` of them in flight.
+
+    :return: Dictionary with throughput, latency percentiles, error count and RSS.
+    """
+    start_rss_mb = get_rss_mb()
+    latencies: list[float] = []
+    errors = 0
+    counter = itertools.count()
+
+    async def worker():
+        nonlocal errors
+        while (index := next(counter)) < requests:
+            started = time.perf_counter()
+            response = await make_request(client, index)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "requests": requests,
+        "errors": errors,
+        "throughput_rps": round(requests / elapsed, 2),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "peak_rss_mb": round(get_peak_rss_mb(), 2),
+        "rss_growth_mb": round(get_peak_rss_mb() - start_rss_mb, 2),
+    }
+
+
+def make_log_payload(index: int) -> dict[str, Any]:
+    return {
+        "timestamp": (datetime(2024, 12, 1) + timedelta(seconds=index)).isoformat(),
+        "severity": "ERROR",
+        "textPayload": f"Benchmark log entry {index}",
+        "resource": {"service_name": "bench-func", "location": "europe-central2"},
+    }
+
+
+async def get_logs(client: AsyncClient, index: int):
+    return await client.get(
+        "/logs/bench-func",
+        params={
+            "cloud_function_region": "europe-central2",
+            "start_time": "2024-12-01T00:00:00",
+            "end_time": "2024-12-31T00:00:00",
+            "severity": "ERROR",
+        },
+    )
+
+
+async def store_log(client: AsyncClient, index: int):
+    return await client.post("/log", json=make_log_payload(index))
+
+
+async def get_log(client: AsyncClient, index: int):
+    return await client.get(f"/log/{index % 100 + 1}")
+
+
+async def run_scenario_in_app(args: argparse.Namespace, name: str) -> dict[str, Any]:
+    """
+    Run a single scenario against a fresh app and database.
+
+    :return: Dictionary with the scenario results.
+    """
+    logging_client = FakeLoggingClient(
+        total_entries=args.entries,
+        page_size=args.page_size,
+        page_latency=args.page_latency,
+        entry_size=args.entry_size,
+    )
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        settings = Settings()
+        settings.set_mysql_connection_string(
+            args.database_url or f"sqlite:///{tmp_dir}/bench.db"
+        )
+        app = api_factory(settings=settings, logging_client=logging_client)
+
+        async with app.router.lifespan_context(app):
+            transport = ASGITransport(app=app)
+            async with AsyncClient(
+                transport=transport, base_url="http://benchmark"
+            ) as client:
+                scenarios = {
+                    "logs": get_logs,
+                    "log_write": store_log,
+                    "log_read": get_log,
+                }
+                if name == "log_read":
+                    # Make sure there is something to read
+                    for index in range(100):
+                        await store_log(client, index)
+                return await run_scenario(
+                    client, scenarios[name], args.requests, args.concurrency
+                )
+
+
+def run_scenario_process(args: argparse.Namespace, name: str) -> dict[str, Any]:
+    return asyncio.run(run_scenario_in_app(args, name))
+
+
+def run_benchmark(args: argparse.Namespace) -> dict[str, Any]:
+    results: dict[str, Any] = {}
+    for name in args.scenarios:
+        # A fresh spawned process per scenario, ru_maxrss never goes down
+        with ProcessPoolExecutor(
+            max_workers=1, mp_context=get_context("spawn")
+        ) as executor:
+            results[name] = executor.submit(run_scenario_process, args, name).result()
+
+    return {
+        "commit": get_commit(),
+        "created_at": datetime.now().isoformat(),
+        "config": {
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "entries": args.entries,
+            "page_size": args.page_size,
+            "page_latency": args.page_latency,
+            "entry_size": args.entry_size,
+        },
+        "results": results,
+    }
+
+
+def compare(report: dict[str, Any], baseline: dict[str, Any]) -> None:
+    print(f"Comparing {report['commit']} against {baseline['commit']}")
+    for name, result in report["results"].items():
+        previous = baseline["results"].get(name)
+        if previous is None:
+            continue
+        for metric in (
+            "throughput_rps",
+            "p50_ms",
+            "p99_ms",
+            "peak_rss_mb",
+            "rss_growth_mb",
+        ):
+            if metric not in previous:
+                continue
+            change = (
+                (result[metric] - previous[metric]) / previous[metric] * 100
+                if previous[metric]
+                else 0.0
+            )
+            print(
+                f"{name:>10} {metric:>15}: {previous[metric]:>10} -> {result[metric]:>10} ({change:+.1f}%)"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--entries", type=int, default=500)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--page-latency", type=float, default=0.0)
+    parser.add_argument("--entry-size", type=int, default=200)
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=SCENARIOS)
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--output", type=Path, default=None)
+    parser.add_argument("--compare", type=Path, default=None)
+    args = parser.parse_args()
+
+    report = run_benchmark(args)
+    output = args.output or Path("bench_output") / f"{report['commit']}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(json.dumps(report["results"], indent=2))
+    print(f"Results saved to {output}")
+
+    if args.compare is not None:
+        compare(report, json.loads(args.compare.read_text()))
+
+
+if __name__ == "__main__":
+    main()
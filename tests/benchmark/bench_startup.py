@@ -0,0 +1,136 @@
+"""
+Startup benchmark for the logs reader API.
+
+Measures the time to import `main` and the time from spawning a uvicorn
+process to its first successful response, with and without fast-start mode,
+and saves the results as JSON so runs can be compared across commits.
+
+    python -m tests.benchmark.bench_startup --runs 5
+"""
+
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+
+from tests.benchmark.bench_api import get_commit
+
+
+IMPORT_SCRIPT = """
+import sys, time
+started = time.perf_counter()
+import main
+elapsed = time.perf_counter() - started
+print(elapsed, "google.cloud.logging" in sys.modules)
+"""
+
+
+def get_free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_import(env: dict[str, str]) -> tuple[float, bool]:
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_SCRIPT],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.split()
+    return float(output[0]), output[1] == "True"
+
+
+def measure_first_response(env: dict[str, str], timeout: float) -> float:
+    port = get_free_port()
+    url = f"http://127.0.0.1:{port}/log/1"
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port)],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            try:
+                urllib.request.urlopen(url, timeout=1)
+                return time.perf_counter() - started
+            except urllib.error.HTTPError:
+                # 404 for a missing entry is still a response
+                return time.perf_counter() - started
+            except (urllib.error.URLError, ConnectionError):
+                time.sleep(0.01)
+        raise TimeoutError(f"No response from {url} within {timeout} seconds")
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def summarize(samples: list[float]) -> dict[str, float]:
+    return {
+        "median_ms": round(statistics.median(samples) * 1000, 2),
+        "min_ms": round(min(samples) * 1000, 2),
+        "max_ms": round(max(samples) * 1000, 2),
+    }
+
+
+def run_benchmark(args: argparse.Namespace) -> dict[str, Any]:
+    results: dict[str, Any] = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        base_env = {
+            **os.environ,
+            "MYSQL_CONNECTION_STRING": f"sqlite:///{tmp_dir}/bench.db",
+            "GOOGLE_SERVICE_ACCOUNT_CREDENTIALS_PATH": f"{tmp_dir}/missing.json",
+        }
+        subprocess.run([sys.executable, "migrate.py"], env=base_env, check=True)
+
+        for mode, fast_start in (("default", "false"), ("fast_start", "true")):
+            env = {**base_env, "FAST_START": fast_start}
+            imports = [measure_import(env) for _ in range(args.runs)]
+            first_responses = [
+                measure_first_response(env, args.timeout) for _ in range(args.runs)
+            ]
+            results[mode] = {
+                "import": summarize([elapsed for elapsed, _ in imports]),
+                "imports_google_cloud_logging": imports[0][1],
+                "first_response": summarize(first_responses),
+            }
+
+    return {
+        "commit": get_commit(),
+        "created_at": datetime.now().isoformat(),
+        "config": {"runs": args.runs},
+        "results": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--output", type=Path, default=None)
+    args = parser.parse_args()
+
+    report = run_benchmark(args)
+    output = args.output or Path("bench_output") / f"startup-{report['commit']}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(json.dumps(report["results"], indent=2))
+    print(f"Results saved to {output}")
+
+
+if __name__ == "__main__":
+    main()
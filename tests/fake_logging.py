@@ -0,0 +1,107 @@
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterator
+
+import itertools
+import time
+
+
+@dataclass
+class FakeResource:
+    type: str = "cloud_run_revision"
+    labels: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class FakeEntry:
+    timestamp: datetime
+    severity: str
+    payload: dict[str, Any] | str
+    resource: FakeResource
+    insert_id: str
+
+
+class FakeLoggingClient:
+    def __init__(
+        self,
+        total_entries: int = 1000,
+        page_size: int = 100,
+        page_latency: float = 0.0,
+        entry_size: int = 200,
+        severity: str = "ERROR",
+        fault: Exception | None = None,
+        slow_calls: int = 0,
+        slow_call_latency: float = 0.0,
+    ):
+        """
+        Local stand-in for `google.cloud.logging.Client`.
+
+        :param total_entries: Number of entries returned by every `list_entries` call.
+        :param page_size: Default number of entries per page.
+        :param page_latency: Seconds slept before every page, like an upstream round trip.
+        :param entry_size: Length of the padding in the message payload of every entry.
+        :param severity: Severity of the generated entries.
+        :param fault: (Optional) Error raised when the first page is fetched.
+        :param slow_calls: Number of first `list_entries` calls with a slow first page.
+        :param slow_call_latency: Extra seconds slept before the first page of a slow call.
+        """
+        self.total_entries = total_entries
+        self.page_size = page_size
+        self.page_latency = page_latency
+        self.entry_size = entry_size
+        self.severity = severity
+        self.fault = fault
+        self.slow_calls = slow_calls
+        self.slow_call_latency = slow_call_latency
+        self.calls = 0
+        self.pages = 0
+        self._insert_ids = itertools.count()
+
+    def _make_entry(self, index: int, start_time: datetime) -> FakeEntry:
+        return FakeEntry(
+            timestamp=start_time + timedelta(seconds=index),
+            severity=self.severity,
+            payload={"message": f"Request {index} failed: {'x' * self.entry_size}"},
+            resource=FakeResource(
+                labels={
+                    "project_id": "benchmark",
+                    "configuration_name": "bench-func",
+                    "service_name": "bench-func",
+                    "location": "europe-central2",
+                    "revision_name": "bench-func-00001",
+                }
+            ),
+            insert_id=f"fake-{next(self._insert_ids)}",
+        )
+
+    def list_entries(
+        self,
+        resource_names=None,
+        filter_: str | None = None,
+        order_by=None,
+        max_results: int | None = None,
+        page_size: int | None = None,
+        page_token=None,
+    ) -> Iterator[FakeEntry]:
+        """
+        Lazily yield generated entries page by page.
+
+        :return: Iterator of FakeEntry objects.
+        """
+        self.calls += 1
+        if self.calls <= self.slow_calls:
+            time.sleep(self.slow_call_latency)
+        if self.fault is not None:
+            raise self.fault
+        page_size = page_size or self.page_size
+        total = self.total_entries
+        if max_results is not None:
+            total = min(total, max_results)
+        start_time = datetime(2024, 12, 1, tzinfo=timezone.utc)
+
+        for index in range(total):
+            if index % page_size == 0:
+                self.pages += 1
+                if self.page_latency:
+                    time.sleep(self.page_latency)
+            yield self._make_entry(index, start_time)
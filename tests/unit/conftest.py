@@ -0,0 +1,30 @@
+import pytest
+from typing import Callable
+from fastapi.testclient import TestClient
+
+from main import api_factory
+from src.pkg.settings import Settings
+from tests.fake_logging import FakeLoggingClient
+
+
+@pytest.fixture
+def settings(tmp_path) -> Settings:
+    settings = Settings()
+    settings.set_mysql_connection_string(f"sqlite:///{tmp_path}/logs.db")
+    return settings
+
+
+@pytest.fixture
+def make_client(settings) -> Callable[..., TestClient]:
+    """
+    Build API test clients on a temporary SQLite database and a fake Cloud Logging client.
+
+    Use as a context manager, so the app lifespan runs.
+    """
+
+    def make_client(logging_client: FakeLoggingClient | None = None) -> TestClient:
+        return TestClient(
+            api_factory(settings, logging_client=logging_client or FakeLoggingClient())
+        )
+
+    return make_client
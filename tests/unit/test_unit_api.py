@@ -0,0 +1,136 @@
+import os
+import subprocess
+import sys
+from sqlalchemy import create_engine, text
+
+import main
+from migrate import migrate
+from src.pkg.cache import SharedQueryCache
+from tests.fake_logging import FakeLoggingClient
+
+
+def test_import_does_not_load_google_cloud_logging():
+    subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import main, sys; assert 'google.cloud.logging' not in sys.modules",
+        ],
+        check=True,
+    )
+
+
+def test_get_logs_with_fake_logging_client(make_client):
+    logging_client = FakeLoggingClient(total_entries=3, page_size=2)
+    with make_client(logging_client) as client:
+        response = client.get(
+            "/logs/bench-func",
+            params={
+                "cloud_function_region": "europe-central2",
+                "start_time": "2024-12-01T00:00:00Z",
+                "end_time": "2024-12-31T00:00:00Z",
+            },
+        )
+
+    assert response.status_code == 200
+    assert len(response.json()) == 3
+    assert logging_client.pages == 2
+
+
+def test_fast_start_skips_schema_creation(settings, make_client):
+    settings.fast_start = True
+    with make_client() as client:
+        assert client.get("/log/1").status_code == 400
+
+    migrate(settings)
+    with make_client() as client:
+        assert client.get("/log/1").status_code == 404
+
+
+def test_migrate_upgrades_baseline_log_table(settings, make_client):
+    # Arrange, `log` table of a deployment predating insertId
+    engine = create_engine(settings.get_mysql_connection_string())
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                "CREATE TABLE log (id INTEGER PRIMARY KEY, timestamp DATETIME NOT NULL,"
+                " severity VARCHAR, textPayload VARCHAR, resource VARCHAR)"
+            )
+        )
+        connection.execute(
+            text(
+                "INSERT INTO log (timestamp, severity, textPayload, resource)"
+                " VALUES ('2024-12-14 12:00:00', 'INFO', 'old', '{}')"
+            )
+        )
+    engine.dispose()
+    settings.fast_start = True
+    log = {
+        "timestamp": "2024-12-15T12:00:00Z",
+        "severity": "ERROR",
+        "textPayload": "a",
+        "resource": {},
+        "insertId": "id-1",
+    }
+
+    # Act
+    migrate(settings)
+    with make_client() as client:
+        stored = client.post("/log", json=log)
+        repeated = client.post("/logs", json=[log])
+        old = client.get("/log/1")
+
+    # Assert
+    assert stored.status_code == 200
+    assert repeated.json()["inserted"] == 0
+    assert old.status_code == 200
+
+
+def test_store_log_rejects_too_long_insert_id(make_client):
+    log = {
+        "timestamp": "2024-12-15T12:00:00Z",
+        "severity": "ERROR",
+        "textPayload": "a",
+        "resource": {},
+    }
+    with make_client() as client:
+        too_long = client.post("/log", json={**log, "insertId": "x" * 129})
+        stored = client.post("/log", json={**log, "insertId": "x" * 128})
+
+    assert too_long.status_code == 422
+    assert stored.status_code == 200
+
+
+def test_lazy_app_has_query_cache(monkeypatch):
+    # Arrange
+    factory_kwargs = {}
+    monkeypatch.setattr(main, "api_factory", lambda **kwargs: factory_kwargs.update(kwargs))
+
+    # Act, `main:app` as served by uvicorn without serve.py
+    main.get_app.__wrapped__()
+
+    # Assert, stale results can be served while the circuit breaker is open
+    assert isinstance(factory_kwargs["query_cache"], SharedQueryCache)
+
+
+def test_dev_server_discovers_lazy_app(tmp_path):
+    env = {
+        **os.environ,
+        "MYSQL_CONNECTION_STRING": f"sqlite:///{tmp_path}/logs.db",
+        "GOOGLE_SERVICE_ACCOUNT_CREDENTIALS_PATH": str(tmp_path / "sa.json"),
+    }
+    # Same discovery as `fastapi dev ./main.py` in run_server.sh
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "from pathlib import Path;"
+            "from fastapi_cli.discover import get_import_data;"
+            "print(get_import_data(path=Path('main.py')).import_string)",
+        ],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.strip() == "main:app"
@@ -0,0 +1,173 @@
+import asyncio
+import os
+import pytest
+import time
+from datetime import datetime
+
+from src.app.repository.domain import LogEntry
+from src.app.service.log import LogsService
+from src.pkg.cache import SharedQueryCache
+
+
+class CountingLogsRepository:
+    def __init__(self, delay: float = 0.0, entries: int = 1):
+        self.calls = 0
+        self.delay = delay
+        self.entries = entries
+
+    async def query_logs(self, **query_params) -> list[LogEntry]:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return [
+            LogEntry(
+                timestamp=query_params["start_time"],
+                severity="ERROR",
+                textPayload="Test log entry",
+                resource={"function_name": query_params["cloud_function_name"]},
+            )
+        ] * self.entries
+
+
+QUERY_PARAMS = dict(
+    cloud_function_name="my-function",
+    cloud_function_region="mock-region",
+    start_time=datetime(2023, 12, 1, 0, 0),
+    end_time=datetime(2023, 12, 25, 23, 59),
+)
+
+
+def test_cache_set_get_and_expire():
+    cache = SharedQueryCache(slots=4, slot_size=1024)
+    assert cache.get("key") is None
+
+    assert cache.set("key", b"value", ttl=60)
+    assert cache.get("key") == b"value"
+    assert cache.get("other") is None
+
+    assert cache.set("key", b"value", ttl=-1)
+    assert cache.get("key") is None
+
+
+def test_cache_bypassed_when_lock_holder_was_killed():
+    # Arrange, a worker killed while holding the lock never releases it
+    cache = SharedQueryCache(slots=4, slot_size=1024, lock_timeout=0.05)
+    assert cache.set("key", b"value", ttl=60)
+    pid = os.fork()
+    if pid == 0:
+        cache._lock.acquire()
+        os._exit(0)
+    os.waitpid(pid, 0)
+
+    # Act
+    started = time.perf_counter()
+    results = [
+        cache.get("key"),
+        cache.get_stale("key"),
+        cache.claim("key", lease=60),
+        cache.set("key", b"value", ttl=60),
+    ]
+    cache.release("key")
+
+    # Assert, misses and own computation instead of blocking the event loop
+    assert results == [None, None, True, False]
+    assert time.perf_counter() - started < 1.0
+
+
+def test_cache_rejects_values_larger_than_slot():
+    cache = SharedQueryCache(slots=4, slot_size=128)
+    assert cache.claim("key", lease=60)
+    assert not cache.set("key", b"x" * 128, ttl=60)
+    assert cache.get("key") is None
+    # Nobody waits for a value that is known not to fit
+    assert cache.claim("key", lease=60)
+    assert cache.claim("key", lease=60)
+
+
+def test_cache_keeps_claims_of_colliding_keys():
+    cache = SharedQueryCache(slots=1, slot_size=1024)
+    assert cache.claim("first", lease=60)
+
+    # Same slot, computed without a claim instead of stealing it
+    assert cache.claim("second", lease=60)
+    assert not cache.set("second", b"value", ttl=60)
+    assert not cache.claim("first", lease=60)
+
+    assert cache.set("first", b"value", ttl=60)
+    assert cache.get("first") == b"value"
+
+
+def test_cache_claim_and_release():
+    cache = SharedQueryCache(slots=4, slot_size=1024)
+    assert cache.claim("key", lease=60)
+    assert not cache.claim("key", lease=60)
+
+    cache.release("key")
+    assert cache.claim("key", lease=-1)
+    # Expired lease can be taken over
+    assert cache.claim("key", lease=60)
+
+    cache.set("key", b"value", ttl=60)
+    assert not cache.claim("key", lease=60)
+
+
+def test_cache_is_shared_with_forked_processes():
+    cache = SharedQueryCache(slots=4, slot_size=1024)
+    pid = os.fork()
+    if pid == 0:
+        cache.set("key", b"from child", ttl=60)
+        os._exit(0)
+    os.waitpid(pid, 0)
+    assert cache.get("key") == b"from child"
+
+
+@pytest.mark.asyncio
+async def test_logs_service_queries_repository_once_per_key():
+    # Arrange
+    repository = CountingLogsRepository(delay=0.1)
+    cache = SharedQueryCache(slots=16, slot_size=4096)
+    services = [
+        LogsService(logs_repository=repository, query_cache=cache) for _ in range(4)
+    ]
+
+    # Act
+    results = await asyncio.gather(
+        *(service.get_logs(**QUERY_PARAMS) for service in services)
+    )
+
+    # Assert
+    assert repository.calls == 1
+    assert all(logs == results[0] for logs in results)
+    assert results[0][0].resource == {"function_name": "my-function"}
+
+
+@pytest.mark.asyncio
+async def test_logs_service_does_not_queue_behind_too_large_results():
+    # Arrange
+    repository = CountingLogsRepository(delay=0.2, entries=100)
+    cache = SharedQueryCache(slots=16, slot_size=1024)
+    services = [
+        LogsService(logs_repository=repository, query_cache=cache) for _ in range(6)
+    ]
+
+    # Act
+    started = time.perf_counter()
+    results = await asyncio.gather(
+        *(service.get_logs(**QUERY_PARAMS) for service in services)
+    )
+    elapsed = time.perf_counter() - started
+
+    # Assert, the waiters query at once after the first result did not fit
+    assert all(len(logs) == 100 for logs in results)
+    assert repository.calls == 6
+    assert elapsed < 0.2 * 3
+
+
+@pytest.mark.asyncio
+async def test_logs_service_without_cache():
+    repository = CountingLogsRepository()
+    service = LogsService(logs_repository=repository)
+
+    await service.get_logs(**QUERY_PARAMS)
+    await service.get_logs(**QUERY_PARAMS)
+
+    assert repository.calls == 2
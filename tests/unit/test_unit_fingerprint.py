@@ -0,0 +1,181 @@
+import pytest
+import time
+from datetime import datetime, timedelta
+from fastapi.testclient import TestClient
+
+from src.app.repository.domain import LogEntry
+from src.app.service.fingerprint import (
+    MAX_LOG_GROUPS,
+    TopKLogGroups,
+    group_logs,
+    normalize_message,
+)
+from tests.fake_logging import FakeLoggingClient
+
+
+def make_log_entry(message: str, seconds: int = 0) -> LogEntry:
+    return LogEntry(
+        timestamp=datetime(2024, 12, 15, 12, 0, 0) + timedelta(seconds=seconds),
+        severity="ERROR",
+        textPayload=message,
+        resource={"function_name": "my-function"},
+    )
+
+
+@pytest.fixture
+def client(make_client) -> TestClient:
+    with make_client(FakeLoggingClient(total_entries=250)) as client:
+        yield client
+
+
+def test_normalize_message():
+    assert (
+        normalize_message(
+            "User 42 request 3f2b8c1e-0d4a-4c2e-9b7a-1a2b3c4d5e6f failed at 0x7ffd after 1.5s, trace deadbeef01"
+        )
+        == "User <num> request <uuid> failed at <hex> after <num>s, trace <hex>"
+    )
+    assert normalize_message(None) == ""
+
+
+def test_group_logs_counts_and_time_range():
+    # Arrange
+    logs = [make_log_entry(f"Timeout after {i} ms", seconds=i) for i in range(5)]
+    logs += [make_log_entry("Connection reset by peer", seconds=10)]
+
+    # Act
+    groups = group_logs(logs, top_k=10)
+
+    # Assert
+    assert [group.count for group in groups] == [5, 1]
+    assert groups[0].pattern == "Timeout after <num> ms"
+    assert groups[0].first_seen == logs[0].timestamp
+    assert groups[0].last_seen == logs[4].timestamp
+    assert groups[0].sample.textPayload == "Timeout after 0 ms"
+    assert groups[0].count_error == 0
+
+
+def test_top_k_groups_stay_bounded():
+    # Arrange
+    groups = TopKLogGroups(top_k=2, capacity=4)
+
+    # Act, two heavy hitters among many unique messages
+    for i in range(1000):
+        groups.add(make_log_entry("Heavy error A"))
+        if i % 2 == 0:
+            groups.add(make_log_entry("Heavy error B"))
+        groups.add(make_log_entry(f"Unique error {chr(65 + i % 26)}{i // 26}"))
+
+    # Assert
+    assert len(groups.groups) == 4
+    assert [group.pattern for group in groups.get_top()] == [
+        "Heavy error A",
+        "Heavy error B",
+    ]
+    assert groups.get_top()[0].count >= 1000
+
+
+def get_letters(index: int) -> str:
+    # Digits are masked by the normalization, spell unique messages in letters
+    letters = ""
+    while True:
+        index, remainder = divmod(index, 26)
+        letters += chr(65 + remainder)
+        if not index:
+            return letters
+
+
+def test_top_k_groups_high_cardinality():
+    # Arrange
+    groups = TopKLogGroups(top_k=MAX_LOG_GROUPS)
+    logs = [make_log_entry(f"Unique error {get_letters(i)}") for i in range(20_000)]
+
+    # Act
+    started = time.perf_counter()
+    groups.add_all(logs)
+    elapsed = time.perf_counter() - started
+
+    # Assert, eviction does not scan all tracked groups
+    assert elapsed < 2.0
+    assert len(groups.groups) == groups.capacity
+    assert len(groups.get_top()) == MAX_LOG_GROUPS
+
+
+def test_get_log_groups_endpoint(client):
+    response = client.get(
+        "/logs/bench-func/groups",
+        params={
+            "cloud_function_region": "europe-central2",
+            "start_time": "2024-12-01T00:00:00Z",
+            "end_time": "2024-12-31T00:00:00Z",
+            "top_k": 5,
+        },
+    )
+
+    assert response.status_code == 200
+    groups = response.json()
+    assert len(groups) == 1
+    assert groups[0]["count"] == 250
+    assert groups[0]["pattern"].startswith("Request <num> failed: ")
+
+
+def test_get_stored_log_groups_endpoint(client):
+    # Arrange
+    logs = [make_log_entry(f"Timeout after {i} ms", seconds=i) for i in range(3)]
+    logs += [make_log_entry("Connection reset by peer", seconds=10)]
+    client.post("/logs", json=[log.model_dump(mode="json") for log in logs])
+
+    # Act
+    response = client.get(
+        "/log/groups",
+        params={
+            "start_time": "2024-12-15T00:00:00",
+            "end_time": "2024-12-16T00:00:00",
+            "severity": "ERROR",
+        },
+    )
+
+    # Assert
+    assert response.status_code == 200
+    groups = response.json()
+    assert [(group["pattern"], group["count"]) for group in groups] == [
+        ("Timeout after <num> ms", 3),
+        ("Connection reset by peer", 1),
+    ]
+    assert groups[0]["first_seen"] == "2024-12-15T12:00:00"
+    assert groups[0]["last_seen"] == "2024-12-15T12:00:02"
+
+
+def test_get_stored_log_groups_converts_offsets_to_utc(client):
+    # Arrange
+    log = make_log_entry("Connection reset by peer")
+    log.timestamp = datetime.fromisoformat("2024-12-15T12:00:00+02:00")
+    client.post("/logs", json=[log.model_dump(mode="json")])
+
+    # Act
+    response = client.get(
+        "/log/groups",
+        params={
+            "start_time": "2024-12-15T10:30:00+01:00",
+            "end_time": "2024-12-15T10:30:00Z",
+        },
+    )
+
+    # Assert
+    assert response.status_code == 200
+    assert [group["first_seen"] for group in response.json()] == [
+        "2024-12-15T10:00:00"
+    ]
+
+
+@pytest.mark.parametrize("top_k", [0, MAX_LOG_GROUPS + 1])
+def test_get_log_groups_invalid_top_k(client, top_k):
+    response = client.get(
+        "/log/groups",
+        params={
+            "start_time": "2024-12-15T00:00:00",
+            "end_time": "2024-12-16T00:00:00",
+            "top_k": top_k,
+        },
+    )
+    assert response.status_code == 422
@@ -0,0 +1,108 @@
+import pytest
+from datetime import datetime
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from src.app.repository.domain import LogEntry
+from src.app.repository.model import Log
+from src.app.repository.store import LogsStore
+from src.app.service.ingest import LogsIngestionService
+from src.pkg.bloom import BloomFilter
+
+
+def make_log_entry(message: str, insert_id: str | None = None) -> LogEntry:
+    return LogEntry(
+        timestamp=datetime(2024, 12, 15, 12, 0, 0),
+        severity="ERROR",
+        textPayload=message,
+        resource={"function_name": "my-function"},
+        insertId=insert_id,
+    )
+
+
+@pytest.fixture
+def session():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+
+
+def make_ingestion_service(session: Session) -> LogsIngestionService:
+    return LogsIngestionService(
+        logs_store=LogsStore(session),
+        seen_filter=BloomFilter(capacity=1000, error_rate=1e-6),
+    )
+
+
+def test_insert_id_is_stable():
+    assert make_log_entry("a").get_insert_id() == make_log_entry("a").get_insert_id()
+    assert make_log_entry("a").get_insert_id() != make_log_entry("b").get_insert_id()
+    assert make_log_entry("a", insert_id="client-id").get_insert_id() == "client-id"
+
+
+def test_bloom_filter_rotates_generations():
+    bloom = BloomFilter(capacity=2, error_rate=1e-6)
+    for key in ("a", "b", "c"):
+        bloom.add(key)
+    assert "a" in bloom and "b" in bloom and "c" in bloom
+
+    for key in ("d", "e"):
+        bloom.add(key)
+    assert "a" not in bloom
+    assert "e" in bloom
+
+
+def test_ingest_bulk_skips_duplicates(session):
+    # Arrange
+    service = make_ingestion_service(session)
+    logs = [make_log_entry("a"), make_log_entry("b"), make_log_entry("a")]
+
+    # Act
+    result = service.ingest(logs)
+    retry = service.ingest(logs)
+
+    # Assert
+    assert (result.received, result.inserted, result.duplicates) == (3, 2, 1)
+    assert (retry.received, retry.inserted, retry.duplicates) == (3, 0, 1)
+    assert retry.probable_duplicates == 2
+    assert len(session.exec(select(Log)).all()) == 2
+
+
+def test_ingest_duplicates_absorbed_by_unique_index(session):
+    # Arrange, fresh bloom filters as after a restart
+    logs = [make_log_entry("a", insert_id="id-1"), make_log_entry("b")]
+    make_ingestion_service(session).ingest(logs)
+
+    # Act
+    result = make_ingestion_service(session).ingest(
+        logs + [make_log_entry("c", insert_id="id-2")]
+    )
+
+    # Assert
+    assert (result.received, result.inserted, result.duplicates) == (3, 1, 2)
+    assert result.probable_duplicates == 0
+    stored = session.exec(select(Log)).all()
+    assert sorted(log.textPayload for log in stored) == ["a", "b", "c"]
+    assert {"id-1", "id-2"} <= {log.insertId for log in stored}
+
+
+def test_ingest_stores_timestamps_in_utc(session):
+    # Arrange, the same instant written with two offsets
+    logs = [
+        make_log_entry("a").model_copy(
+            update={"timestamp": datetime.fromisoformat(timestamp)}
+        )
+        for timestamp in ("2024-12-15T12:00:00+02:00", "2024-12-15T10:00:00Z")
+    ]
+
+    # Act
+    result = make_ingestion_service(session).ingest(logs)
+
+    # Assert
+    assert result.inserted == 1
+    assert session.exec(select(Log.timestamp)).all() == [datetime(2024, 12, 15, 10)]
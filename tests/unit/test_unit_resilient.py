@@ -0,0 +1,242 @@
+import asyncio
+import pytest
+import time
+from datetime import datetime
+from src.app.infrastructure.logging_client import set_list_entries_timeout
+from src.app.repository.log import (
+    CloudLogsQuery,
+    CloudLogsTimeoutException,
+    CloudLogsUnavailableException,
+    InvalidFilterQueryException,
+)
+from src.app.repository.resilient import (
+    CircuitOpenException,
+    CloudLogsGuard,
+    ResilientCloudLogsQuery,
+)
+from src.app.service.log import LogsService
+from src.pkg.cache import SharedQueryCache
+from src.pkg.circuit_breaker import CircuitBreaker, CircuitState
+from src.pkg.executor import BoundedExecutor
+from tests.fake_logging import FakeLoggingClient
+
+QUERY_PARAMS = dict(
+    cloud_function_name="my-function",
+    cloud_function_region="mock-region",
+    start_time=datetime(2024, 12, 1, 0, 0),
+    end_time=datetime(2024, 12, 25, 23, 59),
+)
+
+
+class BadRequest(Exception):
+    code = 400
+
+
+class TooManyRequests(Exception):
+    code = 429
+
+
+def make_query(
+    logging_client: FakeLoggingClient,
+    deadline: float = 5.0,
+    hedge_delay: float | None = None,
+    failure_threshold: int = 2,
+    executor: BoundedExecutor | None = None,
+) -> ResilientCloudLogsQuery:
+    guard = CloudLogsGuard(
+        circuit_breaker=CircuitBreaker(
+            failure_threshold=failure_threshold, reset_timeout=60
+        ),
+        deadline=deadline,
+        hedge_delay=hedge_delay,
+        executor=executor,
+    )
+    return ResilientCloudLogsQuery(
+        CloudLogsQuery(logging_client, executor=executor), guard=guard
+    )
+
+
+def test_circuit_breaker_transitions():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+    breaker.record_failure()
+    assert breaker.allow_request()
+
+    breaker.record_failure()
+    assert breaker.get_state() == CircuitState.OPEN
+    assert not breaker.allow_request()
+    assert breaker.metrics.rejected == 1
+
+    time.sleep(0.06)
+    assert breaker.allow_request()
+    assert breaker.get_state() == CircuitState.HALF_OPEN
+    # Only a single probe is let through
+    assert not breaker.allow_request()
+
+    breaker.record_success()
+    assert breaker.get_state() == CircuitState.CLOSED
+    assert breaker.metrics.opened == 1
+
+
+@pytest.mark.asyncio
+async def test_query_logs_deadline_stops_fetching_thread():
+    # Arrange
+    logging_client = FakeLoggingClient(
+        total_entries=20, page_size=1, page_latency=0.05
+    )
+    executor = BoundedExecutor(max_workers=2)
+    query = make_query(logging_client, deadline=0.1, executor=executor)
+
+    # Act
+    with pytest.raises(CloudLogsTimeoutException):
+        await query.query_logs(**QUERY_PARAMS)
+    await asyncio.sleep(0.3)
+
+    # Assert, the thread gave up on the next entry instead of paging on
+    assert query.guard.metrics.timeouts == 1
+    assert query.guard.circuit_breaker.metrics.failures == 1
+    assert executor.get_in_flight() == 0
+    assert logging_client.pages <= 4
+
+
+@pytest.mark.asyncio
+async def test_query_logs_skips_hedging_when_executor_saturated():
+    # Arrange
+    logging_client = FakeLoggingClient(
+        total_entries=3, slow_calls=1, slow_call_latency=0.2
+    )
+    executor = BoundedExecutor(max_workers=1)
+    query = make_query(logging_client, hedge_delay=0.05, executor=executor)
+
+    # Act
+    logs = await query.query_logs(**QUERY_PARAMS)
+
+    # Assert
+    assert len(logs) == 3
+    assert logging_client.calls == 1
+    assert query.guard.metrics.hedged_requests == 0
+    assert query.guard.metrics.hedges_skipped == 1
+
+
+@pytest.mark.asyncio
+async def test_stream_logs_chunk_deadline():
+    # Arrange
+    query = make_query(
+        FakeLoggingClient(total_entries=1, page_latency=0.5), deadline=0.05
+    )
+
+    # Act & Assert
+    with pytest.raises(CloudLogsTimeoutException):
+        async for _ in query.stream_logs(**QUERY_PARAMS):
+            pass
+    assert query.guard.metrics.timeouts == 1
+    assert query.guard.circuit_breaker.metrics.failures == 1
+
+
+@pytest.mark.asyncio
+async def test_logs_service_serves_stale_results_from_shared_cache():
+    # Arrange
+    logging_client = FakeLoggingClient(total_entries=3)
+    query = make_query(logging_client)
+    cache = SharedQueryCache(slots=4, slot_size=64 * 1024)
+    logs = await LogsService(query, query_cache=cache, cache_ttl=-1).get_logs(
+        **QUERY_PARAMS
+    )
+
+    # Act
+    logging_client.fault = ConnectionError("backend down")
+    services = [
+        LogsService(query, query_cache=cache, metrics=query.guard.metrics)
+        for _ in range(3)
+    ]
+    stale_logs = [await service.get_logs(**QUERY_PARAMS) for service in services]
+
+    # Assert
+    assert stale_logs == [logs] * 3
+    assert all(service.served_stale for service in services)
+    assert logging_client.calls == 3
+    assert query.guard.circuit_breaker.get_state() == CircuitState.OPEN
+    assert query.guard.metrics.stale_results_served == 3
+    # Stale results are not cached again as fresh
+    assert cache.get(services[0].get_cache_key(QUERY_PARAMS)) is None
+    with pytest.raises(CircuitOpenException):
+        await services[0].get_logs(**{**QUERY_PARAMS, "severity": "ERROR"})
+
+
+@pytest.mark.asyncio
+async def test_query_logs_hedged_request_wins():
+    # Arrange
+    logging_client = FakeLoggingClient(
+        total_entries=3, slow_calls=1, slow_call_latency=0.5
+    )
+    query = make_query(logging_client, hedge_delay=0.05)
+
+    # Act
+    started = time.perf_counter()
+    logs = await query.query_logs(**QUERY_PARAMS)
+
+    # Assert
+    assert time.perf_counter() - started < 0.4
+    assert len(logs) == 3
+    assert query.guard.metrics.hedged_requests == 1
+    assert query.guard.metrics.hedged_wins == 1
+
+
+@pytest.mark.asyncio
+async def test_query_logs_invalid_filter_keeps_circuit_closed():
+    query = make_query(FakeLoggingClient(fault=BadRequest("Unparseable filter")))
+
+    for _ in range(3):
+        with pytest.raises(InvalidFilterQueryException):
+            await query.query_logs(**QUERY_PARAMS)
+
+    assert query.guard.circuit_breaker.get_state() == CircuitState.CLOSED
+    assert query.guard.circuit_breaker.metrics.failures == 0
+
+
+@pytest.mark.asyncio
+async def test_query_logs_quota_exhaustion_opens_circuit():
+    query = make_query(FakeLoggingClient(fault=TooManyRequests("Quota exceeded")))
+
+    for _ in range(2):
+        with pytest.raises(CloudLogsUnavailableException):
+            await query.query_logs(**QUERY_PARAMS)
+
+    assert query.guard.circuit_breaker.get_state() == CircuitState.OPEN
+    assert query.guard.circuit_breaker.metrics.failures == 2
+
+
+def test_set_list_entries_timeout():
+    from google.auth.credentials import AnonymousCredentials
+    from google.cloud import logging
+
+    client = logging.Client(project="my-project", credentials=AnonymousCredentials())
+    set_list_entries_timeout(client, rpc_timeout=5.0)
+
+    list_log_entries = client.logging_api._gapic_api.list_log_entries
+    assert list_log_entries.keywords["timeout"] == 5.0
+    assert list_log_entries.keywords["retry"].timeout == 5.0
+
+
+def test_get_logs_backend_unavailable(settings, make_client):
+    # Arrange
+    settings.circuit_breaker_failure_threshold = 1
+    logging_client = FakeLoggingClient(fault=ConnectionError("backend down"))
+    params = {
+        "cloud_function_region": "europe-central2",
+        "start_time": "2024-12-01T00:00:00Z",
+        "end_time": "2024-12-31T00:00:00Z",
+    }
+
+    with make_client(logging_client) as client:
+        # Act
+        first = client.get("/logs/bench-func", params=params)
+        second = client.get("/logs/bench-func", params=params)
+        metrics = client.get("/metrics/cloud-logs").json()
+
+    # Assert
+    assert first.status_code == 503
+    assert second.status_code == 503
+    assert second.json() == {"detail": "Cloud Logging circuit breaker is open."}
+    assert logging_client.calls == 1
+    assert metrics["circuit_breaker"]["state"] == "open"
+    assert metrics["circuit_breaker"]["rejected"] == 1
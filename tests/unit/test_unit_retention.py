@@ -0,0 +1,181 @@
+import pytest
+from datetime import datetime, timedelta
+from pydantic import ValidationError
+from sqlalchemy import inspect, text
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from src.app.repository.migration import migrate_schema
+from src.app.repository.model import Log, LogRollup
+from src.app.repository.retention import (
+    LogsRetentionRepository,
+    RetentionConflictException,
+    RetentionPolicy,
+)
+
+NOW = datetime(2024, 12, 31, 12, 0, 0)
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        # 5 expired entries spread over two hours, 2 fresh entries
+        for minutes in (0, 10, 20, 70, 80):
+            session.add(
+                Log(
+                    timestamp=datetime(2024, 11, 1, 10, 0, 0)
+                    + timedelta(minutes=minutes),
+                    severity="ERROR" if minutes % 20 == 0 else None,
+                    textPayload="expired",
+                )
+            )
+        for days in (1, 2):
+            session.add(
+                Log(timestamp=NOW - timedelta(days=days), severity="INFO")
+            )
+        session.commit()
+    return engine
+
+
+def test_purge_expired_in_batches(engine):
+    # Arrange
+    retention = LogsRetentionRepository(
+        engine, RetentionPolicy(retention_days=30, batch_size=2)
+    )
+
+    # Act
+    deleted = retention.purge_expired(now=NOW)
+
+    # Assert
+    assert deleted == 5
+    assert retention.metrics.batches == 3
+    assert retention.metrics.deleted_rows == 5
+    assert retention.metrics.rolled_up_rows == 0
+    with Session(engine) as session:
+        remaining = session.exec(select(Log)).all()
+        assert len(remaining) == 2
+        assert all(log.severity == "INFO" for log in remaining)
+        assert session.exec(select(LogRollup)).all() == []
+
+
+def test_purge_expired_with_rollup(engine):
+    # Arrange
+    retention = LogsRetentionRepository(
+        engine, RetentionPolicy(retention_days=30, batch_size=2, rollup=True)
+    )
+
+    # Act
+    retention.purge_expired(now=NOW)
+
+    # Assert
+    assert retention.metrics.rolled_up_rows == 5
+    with Session(engine) as session:
+        rollups = {
+            (rollup.hour.hour, rollup.severity): rollup.count
+            for rollup in session.exec(select(LogRollup)).all()
+        }
+    assert rollups == {
+        (10, "ERROR"): 2,
+        (10, "DEFAULT"): 1,
+        (11, "ERROR"): 1,
+        (11, "DEFAULT"): 1,
+    }
+
+
+def test_purge_expired_nothing_to_delete(engine):
+    # Arrange
+    retention = LogsRetentionRepository(
+        engine, RetentionPolicy(retention_days=365, batch_size=2)
+    )
+
+    # Act
+    deleted = retention.purge_expired(now=NOW)
+
+    # Assert
+    assert deleted == 0
+    assert retention.metrics.runs == 1
+    assert retention.metrics.batches == 0
+    assert retention.metrics.last_cutoff == NOW - timedelta(days=365)
+
+
+def test_purge_expired_runs_in_one_process_per_lease(engine):
+    # Arrange
+    policy = RetentionPolicy(retention_days=30, batch_size=2, lease_seconds=60)
+    first = LogsRetentionRepository(engine, policy, owner="worker-1")
+    second = LogsRetentionRepository(engine, policy, owner="worker-2")
+
+    # Act
+    deleted = first.purge_expired(now=NOW)
+    skipped = second.purge_expired(now=NOW)
+
+    # Assert
+    assert (deleted, skipped) == (5, 0)
+    assert second.metrics.skipped_runs == 1
+    assert second.metrics.runs == 0
+    # The owner renews its own lease, an expired lease is taken over
+    assert first.acquire_lease()
+    expired = LogsRetentionRepository(
+        engine, policy.model_copy(update={"lease_seconds": -1}), owner="worker-1"
+    )
+    assert expired.acquire_lease()
+    assert second.acquire_lease()
+    assert not first.acquire_lease()
+
+
+def test_purge_batch_retries_are_bounded(engine, monkeypatch):
+    # Arrange
+    retention = LogsRetentionRepository(
+        engine, RetentionPolicy(retention_days=30, batch_size=2)
+    )
+    attempts = []
+    monkeypatch.setattr(
+        retention, "try_purge_batch", lambda cutoff: attempts.append(cutoff)
+    )
+
+    # Act & Assert
+    with pytest.raises(RetentionConflictException):
+        retention.purge_batch(NOW)
+    assert len(attempts) == 3
+
+def test_migrate_schema_adds_timestamp_index():
+    # Arrange
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    with engine.begin() as connection:
+        # `log` table of a deployment predating the timestamp index
+        connection.execute(
+            text(
+                "CREATE TABLE log (id INTEGER PRIMARY KEY, timestamp DATETIME NOT NULL,"
+                " severity VARCHAR, textPayload VARCHAR, resource VARCHAR,"
+                " insertId VARCHAR(128) UNIQUE)"
+            )
+        )
+
+    # Act
+    created = migrate_schema(engine)
+
+    # Assert
+    assert "ix_log_timestamp" in created
+    indexes = {index["name"] for index in inspect(engine).get_indexes("log")}
+    assert "ix_log_timestamp" in indexes
+    assert migrate_schema(engine) == []
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        {"retention_days": 0},
+        {"retention_days": -1},
+        {"retention_days": 30, "batch_size": 0},
+        {"retention_days": 30, "batch_pause_seconds": -1},
+        {"retention_days": 30, "lease_seconds": -1},
+    ],
+)
+def test_retention_policy_rejects_invalid_values(values):
+    with pytest.raises(ValidationError):
+        RetentionPolicy(**values)
@@ -0,0 +1,46 @@
+import multiprocessing
+import os
+import time
+from contextlib import asynccontextmanager
+from fastapi import FastAPI
+
+from src.pkg.server import WorkerStartupException, serve
+
+
+def test_serve_stops_after_repeated_startup_failures():
+    # Arrange
+    starts = multiprocessing.get_context("fork").Value("i", 0)
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        with starts.get_lock():
+            starts.value += 1
+        raise RuntimeError("Database is unreachable")
+        yield
+
+    app = FastAPI(lifespan=lifespan)
+
+    # Act
+    started = time.monotonic()
+    pid = os.fork()
+    if pid == 0:
+        exit_code = 1
+        try:
+            serve(
+                app,
+                host="127.0.0.1",
+                port=0,
+                workers=1,
+                max_startup_failures=3,
+                respawn_backoff_seconds=0.05,
+            )
+        except WorkerStartupException:
+            exit_code = 42
+        finally:
+            os._exit(exit_code)
+    _, status = os.waitpid(pid, 0)
+
+    # Assert, restarted with a backoff of 0.05 + 0.1 seconds, then stopped
+    assert os.waitstatus_to_exitcode(status) == 42
+    assert starts.value == 3
+    assert time.monotonic() - started >= 0.15